@@ -0,0 +1,148 @@
+from bs4 import BeautifulSoup
+
+# Import the optional HTML parsers if they are installed
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+# The HTML parser to use, either 'selectolax', 'lxml' or 'html.parser' (from fastest to slowest)
+# If the chosen parser isn't installed, the next fastest one that is installed is used instead
+_PARSER_BACKEND = 'selectolax'
+
+
+class _SelectolaxTag:
+    """Wraps a selectolax node so it can be searched like a BeautifulSoup tag
+
+    """
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        """Gets the text of the node and all of its descendants
+
+        Returns:
+            str: The text
+
+        """
+        return self.node.text(deep=True)
+
+    def _matches(self, node, name, class_):
+        """Checks if a node has a tag name and, like BeautifulSoup, exactly the given class attribute
+
+        Args:
+            node(Node): The node to check
+            name(str): The tag name
+            class_(str): The class attribute, or None to match any
+
+        Returns:
+            bool: True if the node matches, otherwise False
+
+        """
+        return node.tag == name and (class_ is None or node.attributes.get('class') == class_)
+
+    def find_all(self, name, class_=None):
+        """Finds every descendant with a tag name and class attribute (selectolax also matches the node itself)
+
+        Args:
+            name(str): The tag name
+            class_(str): The class attribute, or None to match any
+
+        Returns:
+            list(_SelectolaxTag): The matching descendants
+
+        """
+        selector = name if class_ is None else f'{name}[class="{class_}"]'
+        return [_SelectolaxTag(node) for node in self.node.css(selector) if node.mem_id != self.node.mem_id]
+
+    def find(self, name, class_=None):
+        """Finds the first descendant with a tag name and class attribute
+
+        Args:
+            name(str): The tag name
+            class_(str): The class attribute, or None to match any
+
+        Returns:
+            _SelectolaxTag: The first matching descendant, or None if there isn't one
+
+        """
+        selector = name if class_ is None else f'{name}[class="{class_}"]'
+        for node in self.node.css(selector):
+            if node.mem_id != self.node.mem_id:
+                return _SelectolaxTag(node)
+
+        return None
+
+    def find_next_sibling(self, name, class_=None):
+        """Finds the first following sibling with a tag name and class attribute
+
+        Args:
+            name(str): The tag name
+            class_(str): The class attribute, or None to match any
+
+        Returns:
+            _SelectolaxTag: The first matching sibling, or None if there isn't one
+
+        """
+        sibling = self.node.next
+        while sibling is not None:
+            if self._matches(sibling, name, class_):
+                return _SelectolaxTag(sibling)
+
+            sibling = sibling.next
+
+        return None
+
+
+def get_backend():
+    """Gets the HTML parser that will be used, falling back to a slower one if the chosen one isn't installed
+
+    Returns:
+        str: The HTML parser, either 'selectolax', 'lxml' or 'html.parser'
+
+    """
+    if _PARSER_BACKEND == 'selectolax' and HTMLParser is not None:
+        return 'selectolax'
+
+    if _PARSER_BACKEND in ('selectolax', 'lxml') and lxml is not None:
+        return 'lxml'
+
+    return 'html.parser'
+
+
+def make_soup(html, parse_only=None):
+    """Parses HTML into a BeautifulSoup object with the fastest tree builder available for the chosen parser
+
+    Args:
+        html(str): The HTML
+        parse_only(SoupStrainer): Only parse the elements that match, if given
+
+    Returns:
+        BeautifulSoup: The parsed HTML
+
+    """
+    features = 'lxml' if get_backend() != 'html.parser' and lxml is not None else 'html.parser'
+    return BeautifulSoup(html, features, parse_only=parse_only)
+
+
+def parse_html(html):
+    """Parses HTML with the chosen parser, into an object that can be searched with find, find_all,
+       find_next_sibling and text like a BeautifulSoup object
+
+    Args:
+        html(str): The HTML
+
+    Returns:
+        object: The parsed HTML
+
+    """
+    if get_backend() == 'selectolax':
+        return _SelectolaxTag(HTMLParser(html).root)
+
+    return make_soup(html)
@@ -0,0 +1,58 @@
+"""Compares keeping fetched pages as the repr of their bytes, as _get_html used to, with decoding them
+
+Run from the repository root with `python benchmarks/bench_decode.py`
+
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import make_grade_page
+from state import get_fixture_state
+from parser import GradePage
+
+# How many times to parse each page, taking the fastest time
+_REPEATS = 20
+
+
+def _time(function, *args):
+    """Times the fastest of several calls to a function
+
+    Args:
+        function(function): The function
+        *args: The arguments to call it with
+
+    Returns:
+        float: The fastest time in milliseconds
+
+    """
+    times = []
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times) * 1000
+
+
+def main():
+    content = make_grade_page(games=16).encode('utf-8')
+    pages = {
+        'bytes repr (old)': str(content),
+        'decoded text (new)': content.decode('utf-8')
+    }
+
+    print(f'{"page":<20} {"chars":>9} {"memory KB":>10} {"state":>6} {"parse ms":>9}  a team')
+    for name, html in pages.items():
+        grade_page = GradePage(html)
+        team = grade_page.matches[0].team2 if grade_page.matches else '-'
+        print(
+            f'{name:<20} {len(html):>9} {sys.getsizeof(html) // 1024:>10} '
+            f'{"yes" if get_fixture_state(html) is not None else "no":>6} {_time(GradePage, html):>9.2f}  {team}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compares extracting a grade page with a separate parse for each piece of information, as create_roster used to,
+with the single parse GradePage does
+
+Run from the repository root with `python benchmarks/bench_grade_page.py`
+
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend
+import parser
+
+from bs4 import BeautifulSoup
+from synthetic import make_grade_page
+
+# How many times to extract each page, taking the fastest time
+_REPEATS = 10
+
+
+def _extract_with_many_parses(grade_html):
+    """Extracts the matches from a grade page the way create_roster used to, parsing the whole page once for each
+       piece of information and each time/location element once more for its time and again for its location
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        list(Match): The matches
+
+    """
+    def parse():
+        return BeautifulSoup(grade_html, 'html.parser')
+
+    def parse_time_location_elements():
+        elements = parse().find_all('div', class_='sc-10c3c88-15 ivbMVO')
+        return [BeautifulSoup(str(element), 'html.parser') for element in elements]
+
+    parser._get_date(parse())
+    location_court_strings = parser._get_location_court_strings(parse_time_location_elements())
+    return parser._create_matches(
+        parser._get_grade(parse()),
+        parser._get_teams(parse()),
+        parser._get_times(parse_time_location_elements()),
+        parser._get_locations(location_court_strings),
+        parser._get_courts(location_court_strings)
+    )
+
+
+def _time(function, *args):
+    """Times the fastest of several calls to a function
+
+    Args:
+        function(function): The function
+        *args: The arguments to call it with
+
+    Returns:
+        float: The fastest time in milliseconds
+
+    """
+    times = []
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times) * 1000
+
+
+def main():
+    # Only pages without embedded state are parsed as HTML
+    grade_html = make_grade_page(games=16, embed_state=False)
+    old_ms = _time(_extract_with_many_parses, grade_html)
+    print(f'{"path":<32} {"ms":>8} {"speedup":>8}')
+    print(f'{"parse per helper (old)":<32} {old_ms:>8.2f} {1:>7.1f}x')
+
+    for parser_backend in ('html.parser', 'lxml', 'selectolax'):
+        backend._PARSER_BACKEND = parser_backend
+        if backend.get_backend() != parser_backend:
+            continue
+
+        new_ms = _time(parser.GradePage, grade_html)
+        print(f'{"GradePage, " + parser_backend:<32} {new_ms:>8.2f} {old_ms / new_ms:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Compares the memory taken by matches stored in plain dict-backed objects, as Match used to be, with the slotted and
+interned Match, including the flipped matches registered as changes when updating an Excel document
+
+Run from the repository root with `python benchmarks/bench_memory.py`
+
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster import Match
+from synthetic import make_match_fields
+
+# The number of matches to store, around a season of every grade
+_MATCHES = 50000
+
+
+class _DictMatch:
+    """Represents a match between two teams, the way Match used to
+
+    """
+    def __init__(self, grade, team1, team2, time, location, court):
+        self.grade = grade
+        self.team1 = team1
+        self.team2 = team2
+        self.time = time
+        self.location = location
+        self.court = court
+
+
+def _flip_dict_match(match):
+    """Flips a match the way registering a change used to, with a new object every time
+
+    Args:
+        match(_DictMatch): The match
+
+    Returns:
+        _DictMatch: The flipped match
+
+    """
+    return _DictMatch(match.grade, match.team2, match.team1, match.time, match.location, match.court)
+
+
+def _measure(create, flip):
+    """Measures the memory taken by matches built from freshly parsed fields, and by flipping each one twice (once as
+       removed and once as added)
+
+    Args:
+        create(function): Creates a match from its fields
+        flip(function): Flips a match
+
+    Returns:
+        tuple(int, int): The KB taken by the matches, and by the matches along with their flipped matches
+
+    """
+    tracemalloc.start()
+
+    # Only the names the matches keep hold of stay in memory once the fields are let go of
+    matches = [create(*match_fields) for match_fields in make_match_fields(_MATCHES)]
+    matches_size = tracemalloc.get_traced_memory()[0]
+    flipped_matches = [flip(match) for match in matches] + [flip(match) for match in matches]
+    total_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del matches, flipped_matches
+    return matches_size // 1024, total_size // 1024
+
+
+def main():
+    print(f'{"match":<22} {"matches KB":>11} {"with flips KB":>14}')
+    for name, create, flip in (
+        ('dict-backed (old)', _DictMatch, _flip_dict_match),
+        ('slotted, interned', Match, lambda match: match.flipped)
+    ):
+        matches_size, total_size = _measure(create, flip)
+        print(f'{name:<22} {matches_size:>11} {total_size:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compares parsing a day's grade pages in this process with parsing them in a pool of spawned processes, the way
+they're started on Windows
+
+Run from the repository root with `python benchmarks/bench_parse_pool.py`
+
+"""
+import os
+import sys
+import time
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser
+
+from synthetic import make_grade_page
+
+# The number of grade pages played on a day, and how many of them need a browser (and so are fragments of a page)
+_GRADES = 40
+_FRAGMENT_GRADES = 10
+
+
+def _time_create_roster(grade_htmls, processes):
+    """Times creating a roster from grade pages that aren't in the parse cache
+
+    Args:
+        grade_htmls(list(str)): The grade HTML strings
+        processes(int): The number of processes to parse with
+
+    Returns:
+        float: The time in milliseconds
+
+    """
+    parser._PARSE_PROCESSES = processes
+    parser._PARSE_POOL_MIN_PAGES = 0
+    with tempfile.TemporaryDirectory() as cache_location:
+        parser._PARSE_CACHE_LOCATION = os.path.join(cache_location, 'rounds.pickle')
+        start = time.perf_counter()
+        parser.create_roster(iter(grade_htmls))
+        return (time.perf_counter() - start) * 1000
+
+
+def main():
+    multiprocessing.set_start_method('spawn')
+
+    grade_htmls = [make_grade_page(games=16, seed=i) for i in range(_GRADES - _FRAGMENT_GRADES)]
+    grade_htmls += [
+        make_grade_page(games=16, embed_state=False, padding=0, seed=i) for i in range(_FRAGMENT_GRADES)
+    ]
+
+    print(f'{"processes":<12} {"ms":>8}')
+    for processes in sorted({1, 2, 4, os.cpu_count()}):
+        print(f'{processes:<12} {_time_create_roster(grade_htmls, processes):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compares bucketing a roster's matches by court with an ordered insert for each match, as Roster.to_dictionary used
+to, with grouping them and sorting each court once
+
+Run from the repository root with `python benchmarks/bench_roster.py`
+
+"""
+import os
+import sys
+import time
+
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import make_roster
+
+# The numbers of matches to bucket, up to a season of every grade
+_SIZES = (2500, 5000, 10000, 20000, 40000)
+
+
+def _insert_match_in_order(match, matches):
+    """Inserts a Match object into a list of matches in order based on the match time, as to_dictionary used to
+
+    Args:
+        match(Match): The Match object to insert
+        matches(list(Match)): The matches
+
+    """
+    if len(matches) == 0:
+        matches.append(match)
+    else:
+        for i, curr_match in zip(range(len(matches)), matches):
+            if match.time < curr_match.time:
+                matches.insert(i, match)
+                break
+            else:
+                if i == len(matches) - 1:
+                    matches.append(match)
+
+
+def _to_dictionary_with_inserts(roster):
+    """Converts a roster into a dictionary the way to_dictionary used to
+
+    Args:
+        roster(Roster): The roster
+
+    Returns:
+        defaultdict: The roster as a dictionary
+
+    """
+    data = defaultdict(lambda: defaultdict(list))
+
+    data['Date'] = roster.date
+    for round_ in roster.rounds:
+        for match in round_.matches:
+            _insert_match_in_order(match, data[match.location][match.court])
+
+    return data
+
+
+def _time(function, *args):
+    """Times a call to a function
+
+    Args:
+        function(function): The function
+        *args: The arguments to call it with
+
+    Returns:
+        tuple(float, object): The time in milliseconds, and what the function returned
+
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    print(f'{"matches":>8} {"insert ms":>10} {"sort ms":>8} {"speedup":>8}  same')
+    for size in _SIZES:
+        roster = make_roster(size)
+        old_ms, old_data = _time(_to_dictionary_with_inserts, roster)
+        new_ms, new_data = _time(roster.to_dictionary)
+        same = all(old_data[location] == new_data[location] for location in old_data)
+        print(f'{size:>8} {old_ms:>10.1f} {new_ms:>8.1f} {old_ms / new_ms:>7.1f}x  {same}')
+
+
+if __name__ == '__main__':
+    main()
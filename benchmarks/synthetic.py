@@ -0,0 +1,134 @@
+import json
+import random
+
+from datetime import datetime, timedelta
+from roster import Location, Court, Match, Round, Roster
+
+# The venues and courts games are allocated to, by their official names
+_VENUES = (
+    'Sandringham Family Leisure Centre',
+    'Parkdale Secondary College',
+    'Mentone Grammar School',
+    'Mentone Girls Secondary College'
+)
+_COURTS = ('Court 1', 'Court 2', 'Court 3', 'Court 4')
+
+# Team names with the kinds of non-ASCII characters club names contain
+_TEAM_NAMES = (
+    'Sandy Sharks', 'Côte Hornets', 'Mentone Magic', 'Parkdale Pelicans', 'Cheltenham’s Chargers', 'Bayside Büffel'
+)
+
+
+def _get_team(i):
+    """Gets the name of a synthetic team
+
+    Args:
+        i(int): The number of the team
+
+    Returns:
+        str: The team name
+
+    """
+    return f'{_TEAM_NAMES[i % len(_TEAM_NAMES)]} {i // len(_TEAM_NAMES) + 1}'
+
+
+def make_grade_page(games=12, embed_state=True, padding=200 * 1024, seed=0):
+    """Builds a synthetic grade page, rendered like a PlayHQ round page with an optional embedded state
+
+    Args:
+        games(int): The number of games in the round
+        embed_state(bool): Whether to embed the fixtures in the page state, like a page that doesn't need a browser
+        padding(int): The number of bytes of script to pad the page with, like the bundles a real page loads
+        seed(int): The seed for the random allocations
+
+    Returns:
+        str: The grade page HTML
+
+    """
+    rng = random.Random(seed)
+    items = []
+    state_games = []
+    for i in range(games):
+        venue = rng.choice(_VENUES)
+        court = rng.choice(_COURTS)
+        time = datetime(1900, 1, 1, 9) + timedelta(minutes=50 * rng.randrange(10))
+        team1 = _get_team(i * 2)
+        team2 = _get_team(i * 2 + 1)
+        items.append(
+            f'<li class="sc-10c3c88-5 gdnNoD"><div>'
+            f'<a class="sc-kEqYlL sc-10c3c88-13 gYjcIn johWCg">{team1}</a>'
+            f'<a class="sc-kEqYlL sc-10c3c88-13 gYjcIn johWCg">{team2}</a></div>'
+            f'<div class="sc-10c3c88-15 ivbMVO"><span class="sc-kEqYlL kjKiYr">{time:%I:%M %p}, Sat</span>'
+            f'<a class="sc-kEqYlL sc-10c3c88-20 bBbCEa kreAQ">{venue} / {court}</a></div></li>'
+        )
+        state_games.append({
+            'home': {'name': team1},
+            'away': {'name': team2},
+            'status': 'UPCOMING',
+            'allocation': {
+                'date': '2023-05-06',
+                'time': f'{time:%H:%M}:00',
+                'court': {'name': court, 'venue': {'name': venue}}
+            }
+        })
+
+    state = ''
+    if embed_state:
+        state_data = {'props': {'pageProps': {
+            'grade': {'name': 'Under 12 Boys Division 3'},
+            'rounds': [{'current': True, 'provisionalDate': '2023-05-06'}],
+            'games': state_games
+        }}}
+        state_string = json.dumps(state_data, ensure_ascii=False)
+        state = f'<script id="__NEXT_DATA__" type="application/json">{state_string}</script>'
+
+    script = f'<script>{"var bundle=0;" * (padding // 13)}</script>'
+    return (
+        f'<html><head>{script}</head><body>'
+        f'<h2 class="sc-kEqYlL sc-1hg285i-0 eoUoDK hALyVo">Under 12 Boys Division 3</h2>'
+        f'<span class="sc-kEqYlL jndYxC">Saturday, 06 May 2023</span>'
+        f'<ul class="sc-10c3c88-4 iEXxNO">{"".join(items)}</ul>{state}</body></html>'
+    )
+
+
+def make_match_fields(matches, seed=0):
+    """Builds the fields of synthetic matches, with teams and grades repeated as often as they are over a season
+
+    Args:
+        matches(int): The number of matches
+        seed(int): The seed for the random allocations
+
+    Returns:
+        list(tuple): The grade, teams, time, location and court of each match
+
+    """
+    rng = random.Random(seed)
+    fields = []
+    for _ in range(matches):
+        # Build each name afresh, like a name parsed from a page
+        grade = ''.join(['U', str(10 + 2 * rng.randrange(5)), rng.choice('BG'), str(rng.randrange(1, 6))])
+        team1 = _get_team(rng.randrange(400))
+        team2 = _get_team(rng.randrange(400))
+        time = datetime(1900, 1, 1, 8) + timedelta(minutes=50 * rng.randrange(12))
+        fields.append((grade, team1, team2, time, rng.choice(list(Location)), rng.choice(list(Court))))
+
+    return fields
+
+
+def make_roster(matches, rounds=40, seed=0):
+    """Builds a synthetic season-scale roster, with teams and grades repeated as often as they are over a season
+
+    Args:
+        matches(int): The number of matches
+        rounds(int): The number of rounds to split the matches between
+        seed(int): The seed for the random allocations
+
+    Returns:
+        Roster: The roster
+
+    """
+    round_matches = [[] for _ in range(rounds)]
+    for i, fields in enumerate(make_match_fields(matches, seed)):
+        round_matches[i % rounds].append(Match(*fields))
+
+    return Roster(datetime(2023, 5, 6), [Round(matches_) for matches_ in round_matches])
@@ -0,0 +1,238 @@
+import os
+import json
+import gzip
+import time
+import zlib
+import hashlib
+
+from threading import Lock
+
+# Where cached HTML is kept, with a compressed file for each distinct piece of content
+_CACHE_LOCATION = 'cache/html'
+_INDEX_LOCATION = f'{_CACHE_LOCATION}/index.json'
+
+# The most space the cached HTML can take up on disk in bytes, before the least recently used HTML is evicted
+_CACHE_SIZE_LIMIT = 64 * 1024 * 1024
+
+# How long cached HTML is used for in seconds, before it's fetched again
+_CACHE_TTL = 10 * 60
+
+# The cache index, which maps each key to the hash of its content, when it was stored and when it was last used
+_index = None
+_index_lock = Lock()
+
+
+def _get_index():
+    """Gets the cache index, loading it from disk on first use
+
+    Returns:
+        dict(str: dict): The cache index
+
+    """
+    global _index
+
+    if _index is None:
+        try:
+            with open(_INDEX_LOCATION) as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+
+    return _index
+
+
+def _save_index():
+    """Saves the cache index to disk
+
+    """
+    os.makedirs(_CACHE_LOCATION, exist_ok=True)
+    with open(f'{_INDEX_LOCATION}.tmp', 'w') as f:
+        json.dump(_index, f)
+
+    os.replace(f'{_INDEX_LOCATION}.tmp', _INDEX_LOCATION)
+
+
+def _content_location(content_hash):
+    """Gets the location of the file that holds a piece of content
+
+    Args:
+        content_hash(str): The hash of the content
+
+    Returns:
+        str: The location of the file
+
+    """
+    return f'{_CACHE_LOCATION}/{content_hash}.gz'
+
+
+def _drop_content(content_hash):
+    """Removes a piece of content that can't be read, along with every key that holds it
+
+    Args:
+        content_hash(str): The hash of the content
+
+    """
+    index = _get_index()
+    for key in [key for key, entry in index.items() if entry['hash'] == content_hash]:
+        del index[key]
+
+    if os.path.isfile(_content_location(content_hash)):
+        os.remove(_content_location(content_hash))
+
+    _save_index()
+
+
+def _evict():
+    """Evicts the least recently used HTML until the cache fits within its size limit
+
+    """
+    index = _get_index()
+
+    # Content can be shared between keys, so only count each file once
+    sizes = {}
+    for entry in index.values():
+        if entry['hash'] not in sizes and os.path.isfile(_content_location(entry['hash'])):
+            sizes[entry['hash']] = os.path.getsize(_content_location(entry['hash']))
+
+    total_size = sum(sizes.values())
+    for key in sorted(index, key=lambda key_: index[key_]['used']):
+        if total_size <= _CACHE_SIZE_LIMIT:
+            break
+
+        content_hash = index.pop(key)['hash']
+        if content_hash in sizes and all(entry['hash'] != content_hash for entry in index.values()):
+            os.remove(_content_location(content_hash))
+            total_size -= sizes.pop(content_hash)
+
+
+def _read_entry(key, expired):
+    """Reads HTML from the cache, marking it as used
+
+    Args:
+        key(str): The key the HTML was stored under
+        expired(bool): Whether to read the HTML even if it has expired
+
+    Returns:
+        tuple(str, dict): The HTML and its cache entry, or None if it isn't cached (or has expired)
+
+    """
+    with _index_lock:
+        entry = _get_index().get(key)
+        if entry is None or (not expired and time.time() - entry['stored'] > _CACHE_TTL):
+            return None
+
+    # Read the file without holding the lock, so pages can be read from the cache at the same time
+    try:
+        with gzip.open(_content_location(entry['hash']), 'rt', encoding='utf-8') as f:
+            html = f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, zlib.error, UnicodeDecodeError):
+        # The file is corrupt (e.g. it was only partly written), so stop anything from using it
+        with _index_lock:
+            _drop_content(entry['hash'])
+
+        return None
+
+    # Only remember when the HTML was used in memory, since the index is saved whenever HTML is stored, and by
+    # save_cache once every page has been read
+    with _index_lock:
+        entry['used'] = time.time()
+
+    return html, entry
+
+
+def get_cached_html(key):
+    """Gets HTML from the cache, if it was stored recently enough
+
+    Args:
+        key(str): The key the HTML was stored under, usually its URL
+
+    Returns:
+        str: The HTML, or None if it isn't cached or has expired
+
+    """
+    cached = _read_entry(key, False)
+    return cached[0] if cached is not None else None
+
+
+def get_revalidation_html(key):
+    """Gets HTML from the cache along with the validators needed to check if it's still current, even if it has
+       expired
+
+    Args:
+        key(str): The key the HTML was stored under, usually its URL
+
+    Returns:
+        tuple(str, str, str): The HTML, its ETag and its Last-Modified date (either of which may be None), or None if
+                              it isn't cached
+
+    """
+    cached = _read_entry(key, True)
+    if cached is None:
+        return None
+
+    html, entry = cached
+    return html, entry.get('etag'), entry.get('last_modified')
+
+
+def refresh_cached_html(key):
+    """Marks HTML in the cache as current again, after the server has confirmed it hasn't changed
+
+    Args:
+        key(str): The key the HTML was stored under, usually its URL
+
+    """
+    with _index_lock:
+        entry = _get_index().get(key)
+        if entry is not None:
+            entry['stored'] = time.time()
+            _save_index()
+
+
+def save_cache():
+    """Saves the cache index to disk, including when each piece of HTML was last used
+
+    """
+    with _index_lock:
+        if _index is not None:
+            _save_index()
+
+
+def cache_html(key, html, etag=None, last_modified=None):
+    """Stores HTML in the cache, evicting the least recently used HTML if the cache is full
+
+    Args:
+        key(str): The key to store the HTML under, usually its URL
+        html(str): The HTML
+        etag(str): The ETag the server sent with the HTML, if any
+        last_modified(str): The Last-Modified date the server sent with the HTML, if any
+
+    """
+    data = html.encode('utf-8')
+    content_hash = hashlib.sha256(data).hexdigest()
+
+    with _index_lock:
+        os.makedirs(_CACHE_LOCATION, exist_ok=True)
+
+        # Identical content is only ever written once, and is written to a temporary file first so a write that's
+        # interrupted never leaves a partly written file in its place
+        if not os.path.isfile(_content_location(content_hash)):
+            temp_location = f'{_content_location(content_hash)}.tmp'
+            with gzip.open(temp_location, 'wb') as f:
+                f.write(data)
+
+            os.replace(temp_location, _content_location(content_hash))
+
+        now = time.time()
+        index = _get_index()
+        old_entry = index.get(key)
+        index[key] = {'hash': content_hash, 'stored': now, 'used': now, 'etag': etag, 'last_modified': last_modified}
+
+        # Remove the content this key used to hold if nothing else holds it
+        if old_entry is not None and all(entry['hash'] != old_entry['hash'] for entry in index.values()):
+            if os.path.isfile(_content_location(old_entry['hash'])):
+                os.remove(_content_location(old_entry['hash']))
+
+        _evict()
+        _save_index()
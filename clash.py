@@ -0,0 +1,131 @@
+from collections import defaultdict
+from heapq import heappush, heappop
+from itertools import groupby, combinations
+from roster import get_slot_lengths
+
+# The format that match times are written in
+_TIME_FORMAT = '%I:%M %p'
+
+
+def _match_string(match):
+    """Describes a match by its teams and grade
+
+    Args:
+        match(Match): The match
+
+    Returns:
+        str: The description of the match
+
+    """
+    teams = [team for team in (match.team1, match.team2) if team]
+    if len(teams) == 2:
+        return f'Match \'{teams[0]} vs {teams[1]}\' ({match.grade})'
+    if teams:
+        return f'Match with \'{teams[0]}\' ({match.grade})'
+
+    return f'Match ({match.grade})'
+
+
+class Clashes:
+    """Represents the matches in a roster that can't all go ahead as scheduled
+
+    """
+    def __init__(self, team_clashes, court_clashes):
+        self.team_clashes = team_clashes
+        self.court_clashes = court_clashes
+
+    def __len__(self):
+        return len(self.team_clashes) + len(self.court_clashes)
+
+    def __str__(self):
+        string = ''
+        if self.team_clashes:
+            string += 'Double Booked Teams:\n'
+            for (grade, team), match1, match2 in self.team_clashes:
+                string += (
+                    f'\tTeam \'{team}\' ({grade}) is playing at {match1.location}, {match1.court} '
+                    f'@ {match1.time.strftime(_TIME_FORMAT)} and at {match2.location}, {match2.court} '
+                    f'@ {match2.time.strftime(_TIME_FORMAT)}\n'
+                )
+
+            string += '\n'
+
+        if self.court_clashes:
+            string += 'Court Clashes:\n'
+            for match1, match2 in self.court_clashes:
+                string += (
+                    f'\t{_match_string(match1)} and {_match_string(match2)} are both on {match1.location}, '
+                    f'{match1.court} @ {match1.time.strftime(_TIME_FORMAT)}\n'
+                )
+
+            string += '\n'
+
+        return string
+
+
+def _sweep(bookings):
+    """Finds every pair of bookings that overlap, treating bookings that start at the same time as overlapping even if
+       their slot length is unknown
+
+    Args:
+        bookings(list(tuple(datetime, datetime, Match))): The start, end and match of each booking, in start order
+
+    Yields:
+        tuple(Match, Match): Each pair of overlapping matches, with the earlier match first
+
+    """
+    # Bookings that are still on, ordered by when they end so finished bookings can be let go of from the front
+    active_bookings = []
+    for i, (start, end, match) in enumerate(bookings):
+        while active_bookings and active_bookings[0][0] <= start and active_bookings[0][2] < start:
+            heappop(active_bookings)
+
+        for active_end, _, active_start, active_match in active_bookings:
+            if active_end > start or active_start == start:
+                yield active_match, match
+
+        heappush(active_bookings, (end, i, start, match))
+
+
+def find_clashes(data):
+    """Finds teams that are playing in overlapping matches, and matches that are on the same court at the same time
+
+    Args:
+        data(defaultdict): The roster as a dictionary
+
+    Returns:
+        Clashes: The clashes
+
+    """
+    # A court with only one start time takes the most common slot length across the roster, so a double booking where
+    # its match is the earlier one isn't missed
+    slot_lengths = get_slot_lengths({
+        (location, court): [match.time for match in matches]
+        for location, courts in data.items() if location != 'Date'
+        for court, matches in courts.items()
+    })
+
+    court_clashes = []
+    team_bookings = defaultdict(list)
+    for location, courts in data.items():
+        if location == 'Date':
+            continue
+
+        for court, matches in courts.items():
+            # Each court's matches are already in time order
+            for _, same_time_matches in groupby(matches, key=lambda match: match.time):
+                court_clashes.extend(combinations(same_time_matches, 2))
+
+            for match in matches:
+                for team in dict.fromkeys((match.team1, match.team2)):
+                    # Teams that haven't been decided yet have no name, and teams are only the same within a grade
+                    if team:
+                        end = match.time + slot_lengths[(location, court)]
+                        team_bookings[(match.grade, team)].append((match.time, end, match))
+
+    team_clashes = []
+    for team, bookings in team_bookings.items():
+        bookings.sort(key=lambda booking: booking[0])
+        team_clashes.extend((team, match1, match2) for match1, match2 in _sweep(bookings))
+
+    return Clashes(team_clashes, court_clashes)
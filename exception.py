@@ -1,2 +1,6 @@
 class RoundNotFoundException(Exception):
     pass
+
+
+class ScrapeException(Exception):
+    pass
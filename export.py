@@ -4,6 +4,7 @@ from openpyxl import load_workbook
 from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
 from roster import Location, Court, Match
+from clash import find_clashes
 
 _ORDINAL_INDICATORS = ('th', 'st', 'nd', 'rd')
 _DATE_FORMAT = '%d/%m/%Y'
@@ -26,6 +27,7 @@ class _MatchChanges:
         self.added = {}
         self.removed = {}
         self.parsed_matches = None
+        self.clashes = None
 
     def add(self, match, half=False, flip=False):
         """Registers a match as added
@@ -36,7 +38,7 @@ class _MatchChanges:
             flip(bool): Whether to flip the teams
 
         """
-        flipped_match = Match(match.grade, match.team2, match.team1, match.time, match.location, match.court)
+        flipped_match = match.flipped
         if half:
             if not flip:
                 self.added[match.team1] = match
@@ -57,7 +59,7 @@ class _MatchChanges:
             flip(bool): Whether to flip the teams
 
         """
-        flipped_match = Match(match.grade, match.team2, match.team1, match.time, match.location, match.court)
+        flipped_match = match.flipped
         if half:
             if not flip:
                 self.removed[match.team1] = match
@@ -188,6 +190,9 @@ class _MatchChanges:
 
                 string += '\n'
 
+        if self.clashes:
+            string += str(self.clashes)
+
         if GRADES_TO_SKIP:
             string += '\nNotes:'
             for grade in GRADES_TO_SKIP:
@@ -672,6 +677,9 @@ def update_excel(roster, excel_location):
     end = excel_location.find('.xlsx')
     filename = f'{excel_location[start:end]}.txt'
 
+    # Check the updated roster for matches that clash with each other
+    match_changes.clashes = find_clashes(data)
+
     # Write the changes to a text file
     path = f'changes/{filename}'
     os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -1,10 +1,11 @@
 import subprocess
+import multiprocessing
 
 from threading import Thread
 from window import *
-from exception import RoundNotFoundException
+from exception import RoundNotFoundException, ScrapeException
 from scraper import get_all_grade_htmls
-from parser import create_roster
+from parser import create_roster, get_parse_cache_stats
 from export import create_excel, get_excel_date, update_excel
 
 
@@ -31,6 +32,25 @@ def _create_roster(date_string, create):
         update_error('Could not scrape the required information from the internet (check your internet connection)')
         raise e
 
+    # Parse the data into a Roster object as each page is scraped
+    try:
+        roster = create_roster(grade_htmls)
+    except ScrapeException as e:
+        update_error('Could not scrape the required information from the internet (check your internet connection)')
+        raise e
+    except Exception as e:
+        update_error('Could not create the roster')
+        raise e
+    finally:
+        # Stop scraping and quit any drivers if parsing stopped early
+        grade_htmls.close()
+
+    # Report how many grade pages didn't need to be parsed again, once the scrape's progress has been reached
+    parse_cache_stats = get_parse_cache_stats()
+    update_progress(
+        f'Parsed grade pages: {parse_cache_stats["hits"]} unchanged, {parse_cache_stats["misses"]} parsed', 95
+    )
+
     # Change the progress message depending on creation or updating
     if create:
         update_msg = 'Parsing the data into an Excel document...'
@@ -39,13 +59,6 @@ def _create_roster(date_string, create):
 
     update_progress(update_msg, 95)
 
-    # Parse the data into a Roster object
-    try:
-        roster = create_roster(grade_htmls)
-    except Exception as e:
-        update_error('Could not create the roster')
-        raise e
-
     return roster
 
 
@@ -119,24 +132,25 @@ def _handle_window():
     curr_tab = None
     process_button_enabled_1 = False
     process_button_enabled_2 = False
-    driver = None
+    drivers = []
 
     # Event Loop
     while True:
         # Handle the window being closed
         event, values = WINDOW.read()
         if event == sg.WIN_CLOSED or event == WINDOW_EXIT_EVENT:
-            # If the window is closed and a driver is still active, quit it
-            if driver is not None:
+            # If the window is closed and any drivers are still active, quit them
+            for driver in drivers:
                 driver.quit()
 
             break
 
         # Receive errors
         if event == ERROR_EVENT:
-            if driver is not None:
+            for driver in drivers:
                 driver.quit()
-                driver = None
+
+            drivers = []
 
             # Update progress items with the error
             WINDOW[PROGRESS_BAR_KEY].update(bar_color=PROGRESS_BAR_ERROR_COLOUR)
@@ -152,9 +166,13 @@ def _handle_window():
                 WINDOW[PROGRESS_TEXT_KEY].update(progress[0])
                 WINDOW[PROGRESS_BAR_KEY].update(progress[1])
 
-            # Receive a driver to quit if the thread is killed while it's active
+            # Receive drivers to quit if the thread is killed while they're active
             if event == THREAD_DRIVER_EVENT:
-                driver = values[THREAD_DRIVER_EVENT]
+                driver, quit_ = values[THREAD_DRIVER_EVENT]
+                if not quit_:
+                    drivers.append(driver)
+                elif driver in drivers:
+                    drivers.remove(driver)
 
             continue
 
@@ -236,4 +254,6 @@ def _handle_window():
 
 
 if __name__ == '__main__':
+    # Let the processes that parse grade pages start from a frozen executable
+    multiprocessing.freeze_support()
     _handle_window()
@@ -1,23 +1,54 @@
-from bs4 import BeautifulSoup
+import os
+import pickle
+import hashlib
+
+from concurrent.futures import ProcessPoolExecutor, Future
 from datetime import datetime
 from roster import *
+from state import get_fixture_state, get_state_string
+from backend import parse_html
 
 TBC = 'TBC'
 
+# The number of processes to parse grade pages in at once, since parsing is CPU bound (1 to parse every page in this
+# process, or None to use every core)
+# Each process has to start and import the program before it can parse anything, which takes far longer than parsing
+# a day's grade pages does, so this is only worth raising when parsing many more pages at once
+_PARSE_PROCESSES = 1
+
+# The number of grade pages that must miss the parse cache before any processes are started, with the pages before
+# that being parsed in this process
+_PARSE_POOL_MIN_PAGES = 200
+
+# Where the information parsed from grade pages is kept, so unchanged pages aren't parsed again
+_PARSE_CACHE_LOCATION = 'cache/rounds.pickle'
+
+# The most grade pages to keep parsed information for, before the least recently used information is evicted
+_PARSE_CACHE_SIZE = 2000
+
+# The version of the information parsed from grade pages, which must be changed whenever the parser changes what it
+# extracts so that information parsed by an older version isn't used
+_PARSER_VERSION = 3
+
+# The number of grade pages that were (hits) and weren't (misses) in the parse cache while creating the last roster
+_parse_cache_stats = {'hits': 0, 'misses': 0}
 
-def _get_date(grade_html):
-    """Gets the date from a grade html string
+
+def _get_date(soup):
+    """Gets the date from a parsed grade page
 
     Args:
-        grade_html(str): The grade HTML string
+        soup(BeautifulSoup): The parsed grade page
 
     Returns:
-        datetime: The date
+        datetime: The date, or None if the page has no date
 
     """
-    soup = BeautifulSoup(grade_html, 'html.parser')
-    date_string = soup.find('span', class_='sc-kEqYlL jndYxC').text
-    return datetime.strptime(date_string, '%A, %d %B %Y')
+    date_element = soup.find('span', class_='sc-kEqYlL jndYxC')
+    if date_element is None:
+        return None
+
+    return datetime.strptime(date_element.text, '%A, %d %B %Y')
 
 
 def _format_grade(grade):
@@ -41,32 +72,30 @@ def _format_grade(grade):
     return grade[age_start:age_end] + grade[section_start:]
 
 
-def _get_grade(grade_html):
-    """Gets the grade from a grade html string
+def _get_grade(soup):
+    """Gets the grade from a parsed grade page
 
     Args:
-        grade_html(str): The grade HTML string
+        soup(BeautifulSoup): The parsed grade page
 
     Returns:
         str: The grade
 
     """
-    soup = BeautifulSoup(grade_html, 'html.parser')
     grade = soup.find('h2', class_='sc-kEqYlL sc-1hg285i-0 eoUoDK hALyVo').text
     return _format_grade(grade)
 
 
-def _get_teams(grade_html):
-    """Gets the teams from a grade html string
+def _get_teams(soup):
+    """Gets the teams from a parsed grade page
 
     Args:
-        grade_html(str): The grade HTML string
+        soup(BeautifulSoup): The parsed grade page
 
     Returns:
         list(str): The teams
 
     """
-    soup = BeautifulSoup(grade_html, 'html.parser')
     matches_element = soup.find('ul', class_='sc-10c3c88-4 iEXxNO')
 
     all_teams = matches_element.find_all('span', class_='sc-kEqYlL sc-10c3c88-13 gYjcIn iPkdqZ')
@@ -92,26 +121,11 @@ def _get_teams(grade_html):
     return teams
 
 
-def _get_time_location_htmls(grade_html):
-    """Gets the HTML strings for the elements that hold the time and location information
+def _get_times(time_location_elements):
+    """Gets the times from the elements that hold the time and location information
 
     Args:
-        grade_html(str): The grade HTML string
-
-    Returns:
-        list(str): The time/location HTML strings
-
-    """
-    soup = BeautifulSoup(grade_html, 'html.parser')
-    time_location_elements = soup.find_all('div', class_='sc-10c3c88-15 ivbMVO')
-    return [str(time_location_element) for time_location_element in time_location_elements]
-
-
-def _get_times(grade_html):
-    """Gets the times from a grade html string
-
-    Args:
-        grade_html(str): The grade HTML string
+        time_location_elements(list(Tag)): The time/location elements
 
     Returns:
         list(datetime): The times
@@ -119,13 +133,11 @@ def _get_times(grade_html):
     """
     times = []
 
-    time_location_htmls = _get_time_location_htmls(grade_html)
-    for time_location_html in time_location_htmls:
-        soup = BeautifulSoup(time_location_html, 'html.parser')
-        if soup.find('span', class_='sc-kEqYlL sc-10c3c88-16 kwnZGb fdFTVQ'):
+    for time_location_element in time_location_elements:
+        if time_location_element.find('span', class_='sc-kEqYlL sc-10c3c88-16 kwnZGb fdFTVQ'):
             time = TBC
         else:
-            time_string = soup.find('span', class_='sc-kEqYlL kjKiYr').text
+            time_string = time_location_element.find('span', class_='sc-kEqYlL kjKiYr').text
             time_string = time_string[:time_string.index(',')]
             time = datetime.strptime(time_string, '%I:%M %p')
 
@@ -134,11 +146,11 @@ def _get_times(grade_html):
     return times
 
 
-def _get_location_court_strings(grade_html):
-    """Gets the strings that contain the location and court information from a grade html string
+def _get_location_court_strings(time_location_elements):
+    """Gets the strings that contain the location and court information from the time/location elements
 
     Args:
-        grade_html(str): The grade HTML string
+        time_location_elements(list(Tag)): The time/location elements
 
     Returns:
         list(str): The location/court strings
@@ -146,13 +158,11 @@ def _get_location_court_strings(grade_html):
     """
     location_court_strings = []
 
-    time_location_htmls = _get_time_location_htmls(grade_html)
-    for time_location_html in time_location_htmls:
-        soup = BeautifulSoup(time_location_html, 'html.parser')
-        if soup.find('span', class_='sc-kEqYlL sc-10c3c88-16 kwnZGb fdFTVQ'):
+    for time_location_element in time_location_elements:
+        if time_location_element.find('span', class_='sc-kEqYlL sc-10c3c88-16 kwnZGb fdFTVQ'):
             location_court_strings.append(TBC)
         else:
-            location_court_element = soup.find('a', class_='sc-kEqYlL sc-10c3c88-20 bBbCEa kreAQ')
+            location_court_element = time_location_element.find('a', class_='sc-kEqYlL sc-10c3c88-20 bBbCEa kreAQ')
             location_court_strings.append(location_court_element.text)
 
     return location_court_strings
@@ -205,26 +215,50 @@ def _get_courts(location_court_strings):
     return courts
 
 
-def _create_matches(grade_html):
-    """Gets the matches from a grade html string
+class GradePage:
+    """Represents the date, grade and matches of a grade page, extracted with a single parse
+       These are the only attributes, whether they come from the embedded state or from the HTML
+
+    """
+    def __init__(self, grade_html):
+        fixture_state = get_fixture_state(grade_html)
+        if fixture_state is not None:
+            self.date = fixture_state.date
+            self.grade = _format_grade(fixture_state.grade)
+            self.matches = _create_matches_from_state(self.grade, fixture_state)
+            return
+
+        soup = parse_html(grade_html)
+        time_location_elements = soup.find_all('div', class_='sc-10c3c88-15 ivbMVO')
+        location_court_strings = _get_location_court_strings(time_location_elements)
+
+        self.date = _get_date(soup)
+        self.grade = _get_grade(soup)
+        self.matches = _create_matches(
+            self.grade,
+            _get_teams(soup),
+            _get_times(time_location_elements),
+            _get_locations(location_court_strings),
+            _get_courts(location_court_strings)
+        )
+
+
+def _create_matches(grade, teams, times, locations, courts):
+    """Gets the matches from the information extracted from a grade page
 
     Args:
-        grade_html(str): The grade HTML string
+        grade(str): The abbreviated grade
+        teams(list(str)): The teams, two for each match
+        times(list(datetime)): The times
+        locations(list(Location)): The locations
+        courts(list(Court)): The courts
 
     Returns:
-        list(str): The matches
+        list(Match): The matches
 
     """
     matches = []
 
-    grade = _get_grade(grade_html)
-    teams = _get_teams(grade_html)
-    times = _get_times(grade_html)
-
-    location_court_strings = _get_location_court_strings(grade_html)
-    locations = _get_locations(location_court_strings)
-    courts = _get_courts(location_court_strings)
-
     for i in range(len(teams) // 2):
         time = times[i]
         location = locations[i]
@@ -240,38 +274,189 @@ def _create_matches(grade_html):
     return matches
 
 
-def _create_round(grade_html):
-    """Creates a Round object from a grade html string
+def _create_matches_from_state(grade, fixture_state):
+    """Gets the matches from the fixture information embedded in a grade page
+
+    Args:
+        grade(str): The abbreviated grade
+        fixture_state(FixtureState): The embedded fixture information
+
+    Returns:
+        list(Match): The matches
+
+    """
+    matches = []
+
+    for game in fixture_state.games:
+        if game.time is None or game.location is None or game.court is None or game.forfeit:
+            continue
+
+        location = Location.from_official_name(game.location)
+        court = _get_courts([game.court])[0]
+        match = Match(grade, game.team1, game.team2, game.time, location, court)
+        matches.append(match)
+
+    return matches
+
+
+def _get_fingerprint(grade_html):
+    """Gets a fingerprint of the content of a grade page that its matches are parsed from
 
     Args:
         grade_html(str): The grade HTML string
 
+    Returns:
+        str: The fingerprint
+
+    """
+    # Only the embedded state is parsed when it holds usable fixture information, so nothing else on the page needs to
+    # be unchanged, but otherwise the rendered HTML is parsed instead (even if the page still has a state)
+    if get_fixture_state(grade_html) is not None:
+        content = get_state_string(grade_html)
+    else:
+        content = grade_html
+
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _load_parse_cache():
+    """Loads the information parsed from grade pages in previous runs, discarding it if an older parser produced it
+
+    Returns:
+        dict(str: tuple): The parsed information by the fingerprint of each grade page, from least to most recently used
+
+    """
+    # Information pickled by older code can fail to load in many ways (e.g. when an enum value has been renamed), and
+    # none of them should stop the roster being created
+    try:
+        with open(_PARSE_CACHE_LOCATION, 'rb') as f:
+            parse_cache = pickle.load(f)
+    except Exception:
+        return {}
+
+    if not isinstance(parse_cache, dict) or parse_cache.get('version') != _PARSER_VERSION:
+        return {}
+
+    return parse_cache['rounds']
+
+
+def _save_parse_cache(rounds):
+    """Saves the information parsed from grade pages, evicting the least recently used information if there's too much
+
+    Args:
+        rounds(dict(str: tuple)): The parsed information by the fingerprint of each grade page, from least to most
+                                  recently used
+
+    """
+    for fingerprint in list(rounds)[:max(len(rounds) - _PARSE_CACHE_SIZE, 0)]:
+        del rounds[fingerprint]
+
+    os.makedirs(os.path.dirname(_PARSE_CACHE_LOCATION), exist_ok=True)
+    with open(_PARSE_CACHE_LOCATION, 'wb') as f:
+        pickle.dump({'version': _PARSER_VERSION, 'rounds': rounds}, f)
+
+
+def get_parse_cache_stats():
+    """Gets how many grade pages were and weren't in the parse cache while creating the last roster
+
+    Returns:
+        dict(str: int): The number of 'hits' and 'misses'
+
+    """
+    return dict(_parse_cache_stats)
+
+
+def _get_round_data(grade_html):
+    """Parses a grade HTML string into compact information about its round, which can be sent between processes
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        tuple(datetime, list(tuple)): The date of the round, and the grade, teams, time, location and court of each
+                                      match
+
+    """
+    grade_page = GradePage(grade_html)
+    match_data = [
+        (match.grade, match.team1, match.team2, match.time, match.location, match.court)
+        for match in grade_page.matches
+    ]
+    return grade_page.date, match_data
+
+
+def _create_round(match_data):
+    """Creates a Round object from the compact information about its matches
+
+    Args:
+        match_data(list(tuple)): The grade, teams, time, location and court of each match
+
     Returns:
         Round: The created Round object
 
     """
-    matches = _create_matches(grade_html)
-    round_ = Round(matches)
-    return round_
+    return Round([Match(*match) for match in match_data])
 
 
 def create_roster(grade_htmls):
-    """Creates a Roster object from a list of grade html strings
+    """Creates a Roster object from grade html strings, parsing each one as soon as it arrives
 
     Args:
-        grade_htmls(list(str)): The grade HTML strings
+        grade_htmls(iterable(str)): The grade HTML strings
 
     Returns:
         Roster: The created Roster object
 
     """
-    rounds = []
-
-    # Check if the date is correct
-    date = _get_date(grade_htmls[0])
-    for grade_html in grade_htmls:
-        round_ = _create_round(grade_html)
-        rounds.append(round_)
+    for counter in _parse_cache_stats:
+        _parse_cache_stats[counter] = 0
+
+    parse_cache = _load_parse_cache()
+
+    # Parse pages in other processes while the rest are still being scraped, only starting them once enough pages have
+    # needed parsing to pay for starting them
+    executor = None
+    try:
+        pending_rounds = []
+        for grade_html in grade_htmls:
+            fingerprint = _get_fingerprint(grade_html)
+            if fingerprint in parse_cache:
+                _parse_cache_stats['hits'] += 1
+                round_data = parse_cache.pop(fingerprint)
+            else:
+                _parse_cache_stats['misses'] += 1
+                if _PARSE_PROCESSES == 1 or _parse_cache_stats['misses'] <= _PARSE_POOL_MIN_PAGES:
+                    round_data = _get_round_data(grade_html)
+                else:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(_PARSE_PROCESSES)
+
+                    round_data = executor.submit(_get_round_data, grade_html)
+
+            pending_rounds.append((fingerprint, round_data))
+
+        # Create the rounds in grade order, moving every page that was used to the most recently used end of the cache
+        roster = Roster(None, [])
+        for fingerprint, round_data in pending_rounds:
+            if isinstance(round_data, Future):
+                round_data = round_data.result()
+
+            parse_cache[fingerprint] = round_data
+            date, match_data = round_data
+
+            # Check if the date is correct
+            if roster.date is None:
+                roster.date = date
+
+            roster.rounds.append(_create_round(match_data))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if roster.date is None:
+        raise ValueError('No grade pages were scraped')
+
+    if _parse_cache_stats['misses']:
+        _save_parse_cache(parse_cache)
 
-    roster = Roster(date, rounds)
     return roster
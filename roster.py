@@ -1,5 +1,10 @@
+import sys
+
+from array import array
+from bisect import bisect_left, bisect_right
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, Counter
+from datetime import datetime, timedelta
 
 
 class Location(Enum):
@@ -89,23 +94,55 @@ class Court(Enum):
         return self.name.replace('_', ' ').title()
 
 
+def _intern(string):
+    """Interns a string, so every copy of a team or grade name shares the same object
+
+    Args:
+        string(str): The string, or any other value to leave as it is
+
+    Returns:
+        str: The interned string
+
+    """
+    return sys.intern(string) if isinstance(string, str) else string
+
+
 class Match:
     """Represents a match between two teams
 
     """
+    __slots__ = ('grade', 'team1', 'team2', 'time', 'location', 'court', '_flipped')
+
     def __init__(self, grade, team1, team2, time, location, court):
-        self.grade = grade
-        self.team1 = team1
-        self.team2 = team2
+        self.grade = _intern(grade)
+        self.team1 = _intern(team1)
+        self.team2 = _intern(team2)
         self.time = time
         self.location = location
         self.court = court
+        self._flipped = None
+
+    @property
+    def flipped(self):
+        """Gets the same match with its teams swapped, which is only created the first time it's needed
+
+        Returns:
+            Match: The flipped match
+
+        """
+        if self._flipped is None:
+            self._flipped = Match(self.grade, self.team2, self.team1, self.time, self.location, self.court)
+            self._flipped._flipped = self
+
+        return self._flipped
 
 
 class Round:
     """Represents a round of matches
 
     """
+    __slots__ = ('matches',)
+
     def __init__(self, matches):
         self.matches = matches
 
@@ -114,30 +151,12 @@ class Roster:
     """Represents a roster of rounds
 
     """
+    __slots__ = ('date', 'rounds')
+
     def __init__(self, date, rounds):
         self.date = date
         self.rounds = rounds
 
-    @classmethod
-    def _insert_match_in_order(cls, match, matches):
-        """Inserts a Match object into a list of matches in order based on the match time
-
-        Args:
-            match(Match): The Match object to insert
-            matches(list(Match)): The matches
-
-        """
-        if len(matches) == 0:
-            matches.append(match)
-        else:
-            for i, curr_match in zip(range(len(matches)), matches):
-                if match.time < curr_match.time:
-                    matches.insert(i, match)
-                    break
-                else:
-                    if i == len(matches) - 1:
-                        matches.append(match)
-
     def to_dictionary(self):
         """Converts the roster object into a dictionary
 
@@ -150,6 +169,439 @@ class Roster:
         data['Date'] = self.date
         for round_ in self.rounds:
             for match in round_.matches:
-                self._insert_match_in_order(match, data[match.location][match.court])
+                data[match.location][match.court].append(match)
+
+        # Sort each court's matches by time once they're all grouped, keeping matches at the same time in round order
+        for location, courts in data.items():
+            if location != 'Date':
+                for matches in courts.values():
+                    matches.sort(key=lambda match: match.time)
 
         return data
+
+
+class RosterTable:
+    """Represents any number of rosters as columns of integer codes, so a whole season can be filtered, grouped and
+       sorted without going through every Match object
+
+    """
+    # The columns of the table and the array type code of each one
+    _COLUMNS = {
+        'date': 'l',
+        'round': 'l',
+        'grade': 'l',
+        'team1': 'l',
+        'team2': 'l',
+        'time': 'h',
+        'location': 'b',
+        'court': 'b'
+    }
+
+    # The columns that hold codes for strings
+    _STRING_COLUMNS = ('grade', 'team1', 'team2')
+
+    # The date that match times are on, since only their time of day is known
+    _TIME_DATE = datetime(1900, 1, 1)
+
+    __slots__ = ('columns', '_strings', '_string_codes')
+
+    def __init__(self, strings=None, string_codes=None, columns=None):
+        self._strings = strings if strings is not None else []
+        self._string_codes = string_codes if string_codes is not None else {}
+        if columns is None:
+            columns = {column: array(typecode) for column, typecode in self._COLUMNS.items()}
+
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    @classmethod
+    def from_roster(cls, roster):
+        """Converts a Roster object into a RosterTable object
+
+        Args:
+            roster(Roster): The Roster object
+
+        Returns:
+            RosterTable: The resulting RosterTable object
+
+        """
+        return cls.from_rosters([roster])
+
+    @classmethod
+    def from_rosters(cls, rosters):
+        """Converts Roster objects, such as one for each date of a season, into a single RosterTable object
+
+        Args:
+            rosters(iterable(Roster)): The Roster objects
+
+        Returns:
+            RosterTable: The resulting RosterTable object
+
+        """
+        table = cls()
+        for roster in rosters:
+            table.add_roster(roster)
+
+        return table
+
+    def add_roster(self, roster):
+        """Adds every match in a Roster object to the end of the table
+
+        Args:
+            roster(Roster): The Roster object
+
+        """
+        date_code = roster.date.toordinal()
+        first_round_code = max(self.columns['round']) + 1 if len(self) else 0
+        for round_code, round_ in enumerate(roster.rounds, first_round_code):
+            for match in round_.matches:
+                self.columns['date'].append(date_code)
+                self.columns['round'].append(round_code)
+                for column in self._STRING_COLUMNS:
+                    self.columns[column].append(self._encode(column, getattr(match, column)))
+
+                self.columns['time'].append(self._encode('time', match.time))
+                self.columns['location'].append(self._encode('location', match.location))
+                self.columns['court'].append(self._encode('court', match.court))
+
+    def to_rosters(self):
+        """Converts the table into a Roster object for each date, with the matches of each round kept together
+
+        Returns:
+            list(Roster): The Roster objects, in date order
+
+        """
+        rounds_by_date = defaultdict(dict)
+        for i in range(len(self)):
+            round_matches = rounds_by_date[self.columns['date'][i]].setdefault(self.columns['round'][i], [])
+            round_matches.append(self._get_match(i))
+
+        return [
+            Roster(self._decode('date', date_code), [Round(matches) for matches in rounds.values()])
+            for date_code, rounds in sorted(rounds_by_date.items())
+        ]
+
+    def to_roster(self):
+        """Converts a table that only holds matches from one date into a Roster object
+
+        Returns:
+            Roster: The resulting Roster object
+
+        """
+        rosters = self.to_rosters()
+        if len(rosters) != 1:
+            raise ValueError(f'The table holds matches from {len(rosters)} dates, rather than one')
+
+        return rosters[0]
+
+    def filter(self, **conditions):
+        """Gets the rows of the table that match every condition, comparing codes rather than values
+
+        Args:
+            **conditions: The value (or collection of values) each column must have, by column name, where 'team'
+                          matches either team
+
+        Returns:
+            RosterTable: A table with the matching rows, in the same order
+
+        """
+        rows = range(len(self))
+        for column, values in conditions.items():
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = (values,)
+
+            if column == 'team':
+                codes = {self._encode('team1', value, False) for value in values}
+                team1s = self.columns['team1']
+                team2s = self.columns['team2']
+                rows = [i for i in rows if team1s[i] in codes or team2s[i] in codes]
+            else:
+                codes = {self._encode(column, value, False) for value in values}
+                column_codes = self.columns[column]
+                rows = [i for i in rows if column_codes[i] in codes]
+
+        return self._take(rows)
+
+    def sort(self, *columns):
+        """Gets the table sorted by some of its columns, keeping rows that are equal in those columns in order
+
+        Args:
+            *columns: The names of the columns to sort by, from most to least significant
+
+        Returns:
+            RosterTable: The sorted table
+
+        """
+        keys = [self._sort_keys(column) for column in columns]
+        rows = sorted(range(len(self)), key=lambda i: tuple(key[i] for key in keys))
+        return self._take(rows)
+
+    def group_by(self, *columns):
+        """Splits the table into groups of rows that have the same values in some of its columns
+
+        Args:
+            *columns: The names of the columns to group by
+
+        Returns:
+            dict(tuple: RosterTable): The table of each group by its values, in the order each group first appears
+
+        """
+        groups = {}
+        column_codes = [self.columns[column] for column in columns]
+        for i in range(len(self)):
+            groups.setdefault(tuple(codes[i] for codes in column_codes), []).append(i)
+
+        return {
+            tuple(self._decode(column, code) for column, code in zip(columns, group_codes)): self._take(rows)
+            for group_codes, rows in groups.items()
+        }
+
+    def _take(self, rows):
+        """Gets a table with some of the rows of this one, sharing its string codes
+
+        Args:
+            rows(iterable(int)): The indices of the rows
+
+        Returns:
+            RosterTable: The table with the rows
+
+        """
+        rows = list(rows)
+        columns = {
+            column: array(self._COLUMNS[column], [codes[i] for i in rows]) for column, codes in self.columns.items()
+        }
+        return RosterTable(self._strings, self._string_codes, columns)
+
+    def _sort_keys(self, column):
+        """Gets a key for each row that sorts a column by its values rather than its codes
+
+        Args:
+            column(str): The name of the column
+
+        Returns:
+            list: The key of each row
+
+        """
+        if column in self._STRING_COLUMNS:
+            return [self._strings[code] for code in self.columns[column]]
+
+        return self.columns[column]
+
+    def _get_match(self, i):
+        """Converts a row of the table into a Match object
+
+        Args:
+            i(int): The index of the row
+
+        Returns:
+            Match: The resulting Match object
+
+        """
+        return Match(*(
+            self._decode(column, self.columns[column][i])
+            for column in ('grade', 'team1', 'team2', 'time', 'location', 'court')
+        ))
+
+    def _encode(self, column, value, add=True):
+        """Converts a value into the code a column holds for it
+
+        Args:
+            column(str): The name of the column
+            value(object): The value
+            add(bool): Whether to give a new string a code, rather than giving it -1
+
+        Returns:
+            int: The code
+
+        """
+        if column in self._STRING_COLUMNS or column == 'team':
+            code = self._string_codes.get(value)
+            if code is None:
+                if not add:
+                    return -1
+
+                code = self._string_codes[value] = len(self._strings)
+                self._strings.append(_intern(value))
+
+            return code
+
+        if column == 'date':
+            return value.toordinal()
+        if column == 'time':
+            return value.hour * 60 + value.minute
+        if column in ('location', 'court'):
+            return value.value if value is not None else 0
+
+        return value
+
+    def _decode(self, column, code):
+        """Converts the code a column holds back into its value
+
+        Args:
+            column(str): The name of the column
+            code(int): The code
+
+        Returns:
+            object: The value
+
+        """
+        if column in self._STRING_COLUMNS:
+            return self._strings[code]
+        if column == 'date':
+            return datetime.fromordinal(code)
+        if column == 'time':
+            return self._TIME_DATE + timedelta(minutes=code)
+        if column == 'location':
+            return Location(code) if code else None
+        if column == 'court':
+            return Court(code) if code else None
+
+        return code
+
+
+def get_slot_lengths(court_times):
+    """Works out how long each court's slots are from its schedule, as the most common gap between its start times
+       A court with only one start time takes the most common gap across every court instead
+
+    Args:
+        court_times(dict(tuple(Location, Court): iterable(datetime))): The start times of the matches at each court
+
+    Returns:
+        dict(tuple(Location, Court): timedelta): The slot length of each court, which is only zero if no court has more
+                                                 than one start time
+
+    """
+    court_gaps = {}
+    all_gaps = Counter()
+    for place, times in court_times.items():
+        times = sorted(set(times))
+        court_gaps[place] = Counter(later - earlier for earlier, later in zip(times, times[1:]))
+        all_gaps.update(court_gaps[place])
+
+    default_length = all_gaps.most_common(1)[0][0] if all_gaps else timedelta(0)
+    return {place: gaps.most_common(1)[0][0] if gaps else default_length for place, gaps in court_gaps.items()}
+
+
+class RosterIndex:
+    """Indexes the matches of a roster by team, by grade and by when they're on at each court, so they can be looked up
+       without going through every round
+       A match is on at its court for the court's slot length, which is worked out from the schedule of every court
+
+    """
+    __slots__ = ('_team_matches', '_grade_matches', '_court_times', '_court_matches', '_slot_lengths')
+
+    def __init__(self, roster=None):
+        # Dictionaries are used as ordered sets of matches, so matches can be removed without searching for them
+        # Teams are indexed by grade as well, as clubs use the same team names in different grades
+        self._team_matches = defaultdict(dict)
+        self._grade_matches = defaultdict(dict)
+
+        # The start times of the matches at each court in order, with the matches in the same order
+        self._court_times = defaultdict(list)
+        self._court_matches = defaultdict(list)
+
+        # The slot length of each court, worked out when it's first needed after the matches change
+        self._slot_lengths = None
+
+        if roster is not None:
+            for round_ in roster.rounds:
+                for match in round_.matches:
+                    self.add(match)
+
+    def add(self, match):
+        """Adds a match to the index
+
+        Args:
+            match(Match): The match
+
+        """
+        for team in (match.team1, match.team2):
+            # Teams that haven't been decided yet have no name
+            if team:
+                self._team_matches[(match.grade, team)][match] = None
+
+        self._grade_matches[match.grade][match] = None
+
+        place = (match.location, match.court)
+        i = bisect_right(self._court_times[place], match.time)
+        self._court_times[place].insert(i, match.time)
+        self._court_matches[place].insert(i, match)
+        self._slot_lengths = None
+
+    def remove(self, match):
+        """Removes a match from the index
+
+        Args:
+            match(Match): The match, which must have been added
+
+        """
+        for team in (match.team1, match.team2):
+            if team:
+                self._team_matches[(match.grade, team)].pop(match, None)
+
+        self._grade_matches[match.grade].pop(match, None)
+
+        place = (match.location, match.court)
+        times = self._court_times[place]
+        matches = self._court_matches[place]
+        for i in range(bisect_left(times, match.time), bisect_right(times, match.time)):
+            if matches[i] is match:
+                del times[i]
+                del matches[i]
+                self._slot_lengths = None
+                break
+
+    def get_team_matches(self, grade, team):
+        """Gets the matches a team is playing in
+
+        Args:
+            grade(str): The abbreviated grade the team plays in
+            team(str): The team
+
+        Returns:
+            list(Match): The matches, in the order they were added
+
+        """
+        return list(self._team_matches.get((grade, team), ()))
+
+    def get_grade_matches(self, grade):
+        """Gets the matches in a grade
+
+        Args:
+            grade(str): The abbreviated grade
+
+        Returns:
+            list(Match): The matches, in the order they were added
+
+        """
+        return list(self._grade_matches.get(grade, ()))
+
+    def get_court_matches(self, location, court, start, end=None):
+        """Gets the matches that are on at a court at a time, or at any point during a period of time
+
+        Args:
+            location(Location): The location
+            court(Court): The court
+            start(datetime): The time, or the start of the period of time
+            end(datetime): The end of the period of time, if it isn't just a single time
+
+        Returns:
+            list(Match): The matches, in time order
+
+        """
+        if self._slot_lengths is None:
+            self._slot_lengths = get_slot_lengths(self._court_times)
+
+        times = self._court_times.get((location, court), [])
+        slot_length = self._slot_lengths.get((location, court), timedelta(0))
+
+        # A match is on from its start time until its slot ends, or only at its start time if no slot length is known
+        if slot_length:
+            first = bisect_right(times, start - slot_length)
+        else:
+            first = bisect_left(times, start)
+
+        last = bisect_right(times, start) if end is None else bisect_left(times, end)
+        return self._court_matches.get((location, court), [])[first:last]
@@ -1,20 +1,32 @@
 import re
 import os
+import json
+import time
+import calendar
 
 import chromedriver_autoinstaller
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import deque
+from queue import Queue, Empty
+from threading import Lock
+from enum import Enum
+from datetime import datetime, timedelta
+from bs4 import SoupStrainer
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError
 from requests_html import HTMLSession
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from exception import RoundNotFoundException
+from exception import RoundNotFoundException, ScrapeException
 from window import update_progress, update_driver
 from export import GRADES_TO_SKIP
+from state import get_fixture_state, get_game_dates
+from cache import get_cached_html, get_revalidation_html, refresh_cached_html, cache_html, save_cache
+from backend import make_soup
 
 # Import a Windows specific constant if the current platform is Windows
 if os.name == 'nt':
@@ -24,16 +36,152 @@ if os.name == 'nt':
 _DOMAIN = 'https://www.playhq.com'
 _COMPETITIONS_URL = _DOMAIN + '/basketball-victoria/org/southern-basketball-association/e1cbc3e3'
 
+# Limit parsing of the shallow scraped pages to the elements that are searched (and everything inside them), so the
+# rest of each page is never built into a tree
+_GRADES_LINK_STRAINER = SoupStrainer('a', href=re.compile('junior-domestic'))
+_GRADE_LIST_STRAINER = SoupStrainer('ul', class_='sc-12ty7r5-0 hrILMC sc-1vy00ws-2 dBMkSW')
+_ROUND_LINK_STRAINER = SoupStrainer('a', class_='sc-2zsuyh-3 kQmXVu')
+_ROUND_DATE_STRAINER = SoupStrainer(['span', 'div', 'h2'], class_=[
+    'sc-kEqYlL jndYxC',
+    'n806zu-0 kxpuUz sc-10c3c88-18 dsJxqP',
+    'sc-kEqYlL sc-1hg285i-0 eoUoDK hALyVo'
+])
+
 # The timeout value in seconds for loading a page (excluding js)
 _PAGE_LOAD_TIMEOUT = 15
 
 # The timeout value in seconds for loading javascript on a webpage
 _JS_LOAD_TIMEOUT = 5
 
+# Whether to only collect the parts of each deep scraped webpage that are needed, instead of its full HTML
+_EXTRACT_FRAGMENTS = True
+
+# The CSS selectors of the elements that are needed to parse a deep scraped webpage
+_FRAGMENT_SELECTORS = (
+    'h2.sc-kEqYlL.sc-1hg285i-0.eoUoDK.hALyVo',
+    'span.sc-kEqYlL.jndYxC',
+    'ul.sc-10c3c88-4.iEXxNO',
+    'div.sc-10c3c88-15.ivbMVO',
+    'div.n806zu-0.kxpuUz.sc-10c3c88-18.dsJxqP',
+    '.n806zu-0.eOOEPz'
+)
+
+# Collects the outer HTML of the elements matching a selector, skipping any inside an element already collected
+_FRAGMENTS_SCRIPT = '''
+const fragments = [];
+for (const element of document.querySelectorAll(arguments[0])) {
+    if (!fragments.some(fragment => fragment.contains(element))) {
+        fragments.push(element);
+    }
+}
+return '<div>' + fragments.map(fragment => fragment.outerHTML).join('') + '</div>';
+'''
+
+# How many times to load a webpage before giving up, and the backoff in seconds between attempts
+_LOAD_ATTEMPTS = 3
+_RETRY_BACKOFF = 1
+_RETRY_BACKOFF_FACTOR = 2
+
+# Whether to read fixtures from the state embedded in each page before falling back to a browser
+_USE_EMBEDDED_STATE = True
+
+# The maximum number of pages to fetch at once while shallow scraping
+_SHALLOW_SCRAPE_WORKERS = 8
+
+# The number of headless Chrome drivers to deep scrape with at once
+_DRIVER_POOL_SIZE = 4
+
+# The number of tabs each driver keeps loading at once
+_TABS_PER_DRIVER = 3
+
+# Whether to block resources the deep scrape doesn't need, like images, fonts, analytics and ads
+_BLOCK_RESOURCES = True
+
+# The URL patterns of the resource types and the analytics and ad hosts that are blocked while resources are blocked
+# Only known hosts are blocked, so any script bundle or API the page needs from another domain still loads
+_BLOCKED_URL_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*hotjar.com*', '*segment.io*', '*segment.com*', '*intercom.io*', '*sentry.io*'
+)
+
+# Where downloaded Chrome drivers are kept, in a folder for each major version of Chrome
+_DRIVER_CACHE_LOCATION = 'drivers'
+
+# Whether to use a cached Chrome driver without calling the installer, which may check online for a driver
+_OFFLINE_DRIVER = True
+
+# The version of Chrome to use a cached driver for, or None to detect the installed version of Chrome
+# This only selects a driver that is already cached, since the installer always downloads the driver for the installed
+# version of Chrome, so without a cached driver for this version the installed version's driver is used instead
+_PINNED_CHROME_VERSION = None
+
+# Where the season index is kept, which maps each grade to the URL of each of its rounds by date
+_SEASON_INDEX_LOCATION = 'cache/season_index.json'
+
+# How long the season index is used for before it's rebuilt
+_SEASON_INDEX_TTL = timedelta(days=7)
+
+# Whether to rebuild the season index on the next run, regardless of how old it is
+_REFRESH_SEASON_INDEX = False
+
+# Whether to find (and if needed download) the Chrome driver in the background from the start of the scrape, so it
+# overlaps the shallow scrape, and to launch Chrome as soon as it's known that a grade needs a browser, rather than
+# doing both only once the browser pages are reached
+_START_DRIVERS_EARLY = True
+
 # Define how much progress is made by each section
 _SHALLOW_SCRAPE_LENGTH = 30
-_OPENING_TABS_LENGTH = 60
-_DEEP_SCRAPE_LENGTH = 5
+_EMBEDDED_SCRAPE_LENGTH = 5
+_DEEP_SCRAPE_LENGTH = 60
+
+
+# How long it took to find a Chrome driver in seconds, once one has been found
+_driver_resolution_time = None
+
+# The number of pages that were confirmed unchanged by the server, were downloaded, and the bytes saved this run
+_revalidation_stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+_revalidation_lock = Lock()
+
+# A session shared between all shallow scraping requests, so connections are reused
+_session = None
+_session_lock = Lock()
+
+
+def _get_session():
+    """Gets the shared HTTP session, creating it on first use
+
+    Returns:
+        HTMLSession: The shared HTTP session
+
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = HTMLSession()
+
+            # Keep enough pooled connections open for every shallow scraping worker
+            adapter = HTTPAdapter(pool_connections=_SHALLOW_SCRAPE_WORKERS, pool_maxsize=_SHALLOW_SCRAPE_WORKERS)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+
+        return _session
+
+
+def _count_revalidation(counter, bytes_saved=0):
+    """Counts the outcome of fetching a page that may have been revalidated
+
+    Args:
+        counter(str): The counter to increase, either 'hits' or 'misses'
+        bytes_saved(int): The number of bytes that didn't need to be downloaded
+
+    """
+    with _revalidation_lock:
+        _revalidation_stats[counter] += 1
+        _revalidation_stats['bytes_saved'] += bytes_saved
 
 
 def _get_html(url):
@@ -43,12 +191,44 @@ def _get_html(url):
         url(str): The URL of the webpage
 
     Returns:
-        str: The HTML of the webpage
+        str: The decoded HTML of the webpage
+
+    Raises:
+        HTTPError: If the server responded with an error (e.g. when rate limited)
 
     """
-    session = HTMLSession()
-    response = session.get(url)
-    return str(response.content)
+    html = get_cached_html(url)
+    if html is not None:
+        return html
+
+    # Ask the server to only send the page if it has changed since it was cached
+    headers = {}
+    cached = get_revalidation_html(url)
+    if cached is not None:
+        if cached[1] is not None:
+            headers['If-None-Match'] = cached[1]
+        if cached[2] is not None:
+            headers['If-Modified-Since'] = cached[2]
+
+    response = _get_session().get(url, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        refresh_cached_html(url)
+        _count_revalidation('hits', len(cached[0].encode('utf-8')))
+        return cached[0]
+
+    # Never hand over or cache an error page (e.g. when rate limited) as if it were the page that was asked for
+    response.raise_for_status()
+
+    # Pages that don't declare a charset are UTF-8, rather than the ISO-8859-1 that requests would assume
+    if 'charset' not in response.headers.get('Content-Type', ''):
+        response.encoding = 'utf-8'
+
+    html = response.text
+    if 200 <= response.status_code < 300:
+        cache_html(url, html, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    _count_revalidation('misses')
+    return html
 
 
 def _url_to_grade(grade_url):
@@ -69,23 +249,45 @@ def _url_to_grade(grade_url):
     return grade
 
 
-def _get_grade_htmls(grade_urls):
+def _get_grade_html(grade_url):
+    """Gets the HTML of a grade webpage, without letting an error response stop the other grades from being scraped
+
+    Args:
+        grade_url(str): The URL of the grade webpage
+
+    Returns:
+        str: The HTML of the webpage, or None if the server responded with an error (e.g. when rate limited)
+
+    """
+    try:
+        return _get_html(grade_url)
+    except HTTPError:
+        return None
+
+
+def _get_grade_htmls(grade_urls, action='Shallow scraping', progress_start=0, progress_length=_SHALLOW_SCRAPE_LENGTH):
     """Gets the HTML of a list of grade URLs
 
     Args:
         grade_urls(list(str)): The URLs of the grade webpages
+        action(str): The action to display while loading
+        progress_start(int): The progress value before any page has loaded
+        progress_length(int): How much progress is made by loading every page
 
     Returns:
-        list(str): The HTML of the webpages
+        list(str): The HTML of the webpages, with None for any webpage the server responded to with an error
 
     """
-    htmls = []
-    for i, grade_url in zip(range(len(grade_urls)), grade_urls):
-        update_info = f'Shallow scraping the \'{_url_to_grade(grade_url)}\' page...'
-        update_progress(update_info, int((_SHALLOW_SCRAPE_LENGTH / len(grade_urls)) * (i + 1)))
-        htmls.append(_get_html(grade_url))
+    with ThreadPoolExecutor(max_workers=_SHALLOW_SCRAPE_WORKERS) as executor:
+        futures = {executor.submit(_get_grade_html, grade_url): grade_url for grade_url in grade_urls}
 
-    return htmls
+        # Report progress as each page arrives, regardless of the order they were requested in
+        for i, future in zip(range(len(futures)), as_completed(futures)):
+            update_info = f'{action} the \'{_url_to_grade(futures[future])}\' page...'
+            update_progress(update_info, progress_start + int((progress_length / len(grade_urls)) * (i + 1)))
+
+        # Return the HTML in the same order as the grade URLs
+        return [future.result() for future in futures]
 
 
 def _get_grades_url(competitions_html):
@@ -98,7 +300,7 @@ def _get_grades_url(competitions_html):
         str: The URL of the Saturday Junior Domestic grades page
 
     """
-    soup = BeautifulSoup(competitions_html, 'html.parser')
+    soup = make_soup(competitions_html, parse_only=_GRADES_LINK_STRAINER)
     ref = soup.find_all('a', href=re.compile('junior-domestic'))[0]['href']
     return _DOMAIN + ref
 
@@ -113,73 +315,185 @@ def _get_grade_urls(grades_html):
         list(str): The list of URLs that correspond to the fixtures for all Saturday grades
 
     """
-    soup = BeautifulSoup(grades_html, 'html.parser')
+    soup = make_soup(grades_html, parse_only=_GRADE_LIST_STRAINER)
     all_grades_element = soup.find('ul', class_='sc-12ty7r5-0 hrILMC sc-1vy00ws-2 dBMkSW')
     saturday_grade_elements = all_grades_element.find_all('a', href=re.compile('saturday'))
     return [_DOMAIN + grade['href'] for grade in saturday_grade_elements]
 
 
-def _get_grade_url_by_round(grade_html, round_index):
-    """Gets the url that corresponds to the fixtures for a specific round
+def _get_round_urls(grade_html):
+    """Gets the urls that correspond to the fixtures for every round
 
     Args:
         grade_html(str): The HTML of the grade page
-        round_index(int): The round index
 
     Returns:
-        str: The URL that corresponds to the fixtures for a specific round
+        list(str): The URLs that correspond to the fixtures for every round, in round order
 
     """
-    soup = BeautifulSoup(grade_html, 'html.parser')
+    soup = make_soup(grade_html, parse_only=_ROUND_LINK_STRAINER)
     round_elements = soup.find_all('a', class_='sc-2zsuyh-3 kQmXVu')
-    round_element = round_elements[round_index]
-    grade_url = _DOMAIN + round_element['href']
-    return grade_url
+    return [_DOMAIN + round_element['href'] for round_element in round_elements]
+
+
+class _PageState(Enum):
+    """Represents the state of a webpage being loaded in a driver
+
+    """
+    LOADING = 1
+    FIXTURES = 2
+    ERROR = 3
+    UNCONFIRMED = 4
+    FAILED = 5
 
+    def __str__(self):
+        return self.name.lower()
 
-def _wait_for_html(driver):
-    """Waits for a webpage to load the required javascript, and then returns its HTML
+
+# The CSS selectors of the elements that finish a webpage loading, in order of precedence
+_OUTCOME_SELECTORS = (
+    (_PageState.FIXTURES, '.sc-10c3c88-5.gdnNoD'),
+    (_PageState.ERROR, '.n806zu-0.eOOEPz'),
+    (_PageState.UNCONFIRMED, '.n806zu-0.kxpuUz.sc-10c3c88-18.dsJxqP')
+)
+
+
+def _get_outcome(driver):
+    """Checks if a webpage has loaded its fixtures, an error or an unconfirmed message, without waiting
 
     Args:
         driver(WebDriver): The driver to use
 
     Returns:
-        str: The HTML of the webpage
+        _PageState: The state of the webpage if it has loaded, otherwise None
 
     """
-    loaded_condition = EC.presence_of_element_located((By.CSS_SELECTOR, '.sc-10c3c88-5.gdnNoD'))
-    WebDriverWait(driver, _JS_LOAD_TIMEOUT).until(loaded_condition)
-    return driver.page_source
+    for state, selector in _OUTCOME_SELECTORS:
+        if driver.find_elements(By.CSS_SELECTOR, selector):
+            return state
+
+    return None
 
 
-def _wait_for_html_error(driver):
-    """Waits for a webpage to load an error, and then returns its HTML
+def _wait_for_outcome(driver):
+    """Waits for a webpage to load its fixtures, an error or an unconfirmed message, whichever appears first
 
     Args:
         driver(WebDriver): The driver to use
 
     Returns:
-        str: The HTML of the webpage
+        _PageState: The state of the webpage once it has loaded
 
     """
-    loaded_condition = EC.presence_of_element_located((By.CSS_SELECTOR, '.n806zu-0.eOOEPz'))
-    WebDriverWait(driver, _JS_LOAD_TIMEOUT).until(loaded_condition)
-    return driver.page_source
+    return WebDriverWait(driver, _JS_LOAD_TIMEOUT).until(_get_outcome)
 
 
-def _wait_for_html_unconfirmed(driver):
-    """Waits for a webpage to load an unconfirmed message, and then returns its HTML
+def _get_fragments(driver):
+    """Gets only the parts of a webpage's HTML that are needed to parse it, collected in the browser
 
     Args:
         driver(WebDriver): The driver to use
 
     Returns:
-        str: The HTML of the webpage
+        str: The HTML of the needed elements, wrapped in a single element
+
+    """
+    return driver.execute_script(_FRAGMENTS_SCRIPT, ', '.join(_FRAGMENT_SELECTORS))
+
+
+def _deep_cache_key(url):
+    """Gets the key that the deep scraped HTML of a webpage is cached under
+
+    Args:
+        url(str): The URL of the webpage
+
+    Returns:
+        str: The cache key, which is kept apart from the HTML fetched without javascript and depends on whether
+             only fragments are extracted
 
     """
-    loaded_condition = EC.presence_of_element_located((By.CSS_SELECTOR, '.n806zu-0.kxpuUz.sc-10c3c88-18.dsJxqP'))
-    WebDriverWait(driver, _JS_LOAD_TIMEOUT).until(loaded_condition)
-    return driver.page_source
+    return f'{url}#{"fragments" if _EXTRACT_FRAGMENTS else "js"}'
+
+
+class _PageLoad:
+    """Loads a webpage in a driver, retrying with a backoff until one of the outcome selectors appears
+
+    """
+    def __init__(self, url):
+        self.url = url
+        self.state = _PageState.LOADING
+        self.attempts = 0
+        self.latency = None
+        self.html = None
+        self._start = None
+
+    def load(self, driver):
+        """Starts loading the webpage in the driver's current tab
+
+        Args:
+            driver(WebDriver): The driver to use
+
+        """
+        if self._start is None:
+            self._start = time.perf_counter()
+
+        self.attempts += 1
+        try:
+            driver.get(self.url)
+        except TimeoutException:
+            # The javascript may still be able to load, so let the wait decide if the attempt failed
+            pass
+
+    def _finish(self, driver, state):
+        """Records the outcome of the webpage once it has loaded
+
+        Args:
+            driver(WebDriver): The driver to use
+            state(_PageState): The state of the webpage
+
+        """
+        self.state = state
+        self.html = _get_fragments(driver) if _EXTRACT_FRAGMENTS else driver.page_source
+        self.latency = time.perf_counter() - self._start
+
+    def poll(self, driver):
+        """Checks if the webpage has finished loading in the driver's current tab, without waiting
+
+        Args:
+            driver(WebDriver): The driver to use
+
+        Returns:
+            bool: True if the webpage has finished loading, otherwise False
+
+        """
+        state = _get_outcome(driver)
+        if state is not None:
+            self._finish(driver, state)
+
+        return state is not None
+
+    def wait(self, driver):
+        """Waits for the webpage to finish loading in the driver's current tab, retrying if it doesn't
+
+        Args:
+            driver(WebDriver): The driver to use
+
+        Raises:
+            TimeoutException: If the webpage didn't load within the allowed number of attempts
+
+        """
+        while self.state == _PageState.LOADING:
+            try:
+                self._finish(driver, _wait_for_outcome(driver))
+            except TimeoutException:
+                if self.attempts >= _LOAD_ATTEMPTS:
+                    self.state = _PageState.FAILED
+                else:
+                    time.sleep(_RETRY_BACKOFF * _RETRY_BACKOFF_FACTOR ** (self.attempts - 1))
+                    self.load(driver)
+
+        if self.state == _PageState.FAILED:
+            raise TimeoutException(f'{self.url} did not load after {self.attempts} attempts')
 
 
 def _is_saturday_match(grade_html):
@@ -192,7 +506,7 @@ def _is_saturday_match(grade_html):
         bool: True if the match is scheduled for Saturday, otherwise False
 
     """
-    soup = BeautifulSoup(grade_html, 'html.parser')
+    soup = make_soup(grade_html, parse_only=_ROUND_DATE_STRAINER)
     date_element = soup.find('span', class_='sc-kEqYlL jndYxC')
     unconfirmed_element = soup.find('div', class_='n806zu-0 kxpuUz sc-10c3c88-18 dsJxqP')
     if date_element and not unconfirmed_element:
@@ -208,81 +522,369 @@ def _is_saturday_match(grade_html):
     return False
 
 
-# noinspection all
-def _get_htmls_with_js(urls):
-    """Gets the HTML after the javascript has loaded from a list of provided URLs
-       If any given webpage or the javascript in the webpage cannot load, it will retry once
+def _get_htmls_from_state(urls):
+    """Gets the HTML of the webpages that embed their fixtures in their state, without loading any javascript
 
     Args:
         urls(list(str)): The URLs of the webpages
 
     Returns:
-        list(str): The list of HTML strings
+        tuple(list(str), list(str)): The HTML of the Saturday webpages with embedded fixtures, and the URLs of the
+                                     webpages that need to be loaded in a browser instead
 
     """
     htmls = []
+    urls_with_js = []
 
-    # Initialise chrome driver
-    update_progress('Downloading Chrome driver...', _SHALLOW_SCRAPE_LENGTH)
-    driver_path = chromedriver_autoinstaller.install()
+    grade_htmls = _get_grade_htmls(urls, 'Fetching', _SHALLOW_SCRAPE_LENGTH, _EMBEDDED_SCRAPE_LENGTH)
+    for url, grade_html in zip(urls, grade_htmls):
+        # Give a page that couldn't be fetched another chance in a browser
+        if grade_html is None:
+            urls_with_js.append(url)
+            continue
+
+        fixture_state = get_fixture_state(grade_html)
+        if fixture_state is not None:
+            if fixture_state.date.weekday() == calendar.SATURDAY:
+                htmls.append(grade_html)
+            continue
+
+        # Skip grades whose games are all known not to be on a Saturday before any browser tab is opened for them
+        game_dates = get_game_dates(grade_html)
+        if game_dates and not any(date.weekday() == calendar.SATURDAY for date in game_dates):
+            continue
+
+        urls_with_js.append(url)
+
+    return htmls, urls_with_js
+
+
+def _block_resources(driver):
+    """Blocks the resource types and analytics and ad hosts the deep scrape doesn't need in the driver's current tab
+
+    Args:
+        driver(WebDriver): The driver to use
+
+    """
+    if not _BLOCK_RESOURCES:
+        return
+
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(_BLOCKED_URL_PATTERNS)})
+
+
+def _create_driver(driver_path):
+    """Creates a headless Chrome driver and registers it with the window
+
+    Args:
+        driver_path(str): The location of the Chrome driver executable
+
+    Returns:
+        WebDriver: The created driver
+
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    if _BLOCK_RESOURCES:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+
+    service = Service(driver_path)
 
     # Hide the Chrome driver console if on Windows
     if os.name == 'nt':
-        service = Service(driver_path)
         service.creationflags = CREATE_NO_WINDOW
-        driver = webdriver.Chrome(service=service)
-    else:
-        driver = webdriver.Chrome()
 
+    driver = webdriver.Chrome(service=service, options=options)
     driver.set_page_load_timeout(_PAGE_LOAD_TIMEOUT)
+    _block_resources(driver)
     update_driver(driver)
+    return driver
 
-    # Position the window off the screen, so it's not visible
-    driver.set_window_position(-10000, 0)
-
-    # A list of grades to display while loading
-    grades = [_url_to_grade(urls[0])]
-
-    # Loads each url in a tab
-    update_info = f'Opening the \'{grades[-1]}\' page...'
-    update_progress(update_info, _SHALLOW_SCRAPE_LENGTH + (_OPENING_TABS_LENGTH // len(urls)))
-    driver.get(urls[0])
-    for i, url in zip(range(2, len(urls) + 1), urls[1:]):
-        grades.append(_url_to_grade(url))
-        update_info = f'Opening the \'{grades[-1]}\' page...'
-        update_progress(update_info, _SHALLOW_SCRAPE_LENGTH + int((_OPENING_TABS_LENGTH / len(urls)) * i))
-
-        driver.execute_script(f'window.open(\'about:blank\', \'{i}\');')
-        driver.switch_to.window(str(i))
-        driver.get(url)
-
-    # Iterate through the tabs, load the javascript and then save the HTML
-    update_progress('Deep scraping the opened pages...', _SHALLOW_SCRAPE_LENGTH + _OPENING_TABS_LENGTH)
-    handles = driver.window_handles
-    for i, handle in zip(range(len(handles)), handles):
+
+class _DriverPool:
+    """Deep scrapes a list of URLs with a pool of Chrome drivers that take URLs from a shared queue
+       Each driver keeps a bounded window of tabs loading, and reuses a tab for the next URL once it's harvested
+
+    """
+    def __init__(self, driver_futures, urls, tabs=_TABS_PER_DRIVER):
+        self.driver_futures = driver_futures[:len(urls)]
+        self.urls = urls
+        self.tabs = tabs
+        self.url_queue = Queue()
+        self.html_queue = Queue()
+        self.lock = Lock()
+        self.scraped = 0
+        self.failed = False
+
+        for url in urls:
+            self.url_queue.put(url)
+
+    def _update_progress(self, page_load):
+        """Reports the progress of the deep scrape, and the outcome of a webpage that has been scraped
+
+        Args:
+            page_load(_PageLoad): The finished load of the webpage
+
+        """
+        with self.lock:
+            self.scraped += 1
+            scraped = self.scraped
+
+        progress_start = _SHALLOW_SCRAPE_LENGTH + _EMBEDDED_SCRAPE_LENGTH
+        update_info = (
+            f'Deep scraped the \'{_url_to_grade(page_load.url)}\' page '
+            f'({page_load.state} in {page_load.latency:.1f}s, {page_load.attempts} attempt(s))...'
+        )
+        update_progress(update_info, progress_start + int((_DEEP_SCRAPE_LENGTH / len(self.urls)) * scraped))
+
+    def _load_next(self, driver, tabs):
+        """Starts loading the next URL from the queue in the driver's current tab
+
+        Args:
+            driver(WebDriver): The driver to use
+            tabs(deque): The tabs that are loading, to add the current tab to
+
+        Returns:
+            bool: True if a URL was loaded, otherwise False if the queue is empty or another driver has failed
+
+        """
+        if self.failed:
+            return False
+
+        try:
+            url = self.url_queue.get_nowait()
+        except Empty:
+            return False
+
+        page_load = _PageLoad(url)
+        page_load.load(driver)
+        tabs.append((driver.current_window_handle, page_load))
+        return True
+
+    def _harvest(self, driver, tabs):
+        """Harvests the first tab to finish loading, or waits for the oldest tab if none have finished yet
+
+        Args:
+            driver(WebDriver): The driver to use
+            tabs(deque): The tabs that are loading
+
+        Returns:
+            _PageLoad: The finished load, with its tab left as the driver's current tab
+
+        """
+        for tab in tabs:
+            handle, page_load = tab
+            driver.switch_to.window(handle)
+            if page_load.poll(driver):
+                tabs.remove(tab)
+                return page_load
+
+        handle, page_load = tabs.popleft()
         driver.switch_to.window(handle)
+        page_load.wait(driver)
+        return page_load
+
+    def _work(self, driver_future):
+        """Waits for a driver to start and scrapes URLs from the queue until it's empty or another driver has failed
+
+        Args:
+            driver_future(Future): The driver being started
+
+        """
         try:
-            htmls.append(_wait_for_html(driver))
-        except TimeoutException:
-            driver.get(urls[i])
+            driver = driver_future.result()
+
+            # Fill the window of tabs, only opening a new tab while there are URLs left to load
+            tabs = deque()
+            while len(tabs) < self.tabs and not self.url_queue.empty():
+                if tabs:
+                    driver.switch_to.new_window('tab')
+                    _block_resources(driver)
+
+                if not self._load_next(driver, tabs):
+                    break
+
+            # Harvest tabs as they finish, reusing each one for the next URL
+            while tabs:
+                page_load = self._harvest(driver, tabs)
+                self.html_queue.put(page_load.html)
+                if page_load.state == _PageState.FIXTURES:
+                    cache_html(_deep_cache_key(page_load.url), page_load.html)
+
+                self._update_progress(page_load)
+                self._load_next(driver, tabs)
+        except Exception:
+            # Stop the other drivers from taking any more URLs, and stop waiting for any more HTML
+            self.failed = True
+            self.html_queue.put(None)
+            raise
+
+    def scrape(self):
+        """Scrapes every URL
+
+        Yields:
+            str: The HTML of each webpage, as soon as it has been scraped
+
+        """
+        with ThreadPoolExecutor(max_workers=len(self.driver_futures)) as executor:
+            futures = [executor.submit(self._work, driver_future) for driver_future in self.driver_futures]
             try:
-                htmls.append(_wait_for_html(driver))
-            except TimeoutException:
-                driver.get(urls[i])
-                try:
-                    htmls.append(_wait_for_html_error(driver))
-                except TimeoutException:
-                    driver.get(urls[i])
-                    try:
-                        htmls.append(_wait_for_html_unconfirmed(driver))
-                    except TimeoutException as e:
-                        driver.quit()
-                        update_driver(None)
-                        raise e
+                for _ in range(len(self.urls)):
+                    html = self.html_queue.get()
+                    if html is None:
+                        break
+
+                    yield html
+            finally:
+                # Stop the drivers early if the HTML is no longer wanted
+                self.failed = True
+
+            for future in futures:
+                future.result()
+
+
+def _resolve_driver():
+    """Gets the location of a Chrome driver that matches the installed (or pinned) major version of Chrome
+       Drivers are downloaded into a cache with a folder for each major version, and in offline mode a cached
+       driver is used without ever calling the installer
+       A pinned version only selects a cached driver (even when offline mode is off), as the installer can only
+       download the driver for the installed version of Chrome
+
+    Returns:
+        str: The location of the Chrome driver executable
+
+    """
+    global _driver_resolution_time
+
+    start = time.perf_counter()
+
+    chrome_version = _PINNED_CHROME_VERSION or chromedriver_autoinstaller.get_chrome_version()
+    driver_path = None
+    if chrome_version is not None:
+        major_version = str(chrome_version).split('.')[0]
+        driver_filename = chromedriver_autoinstaller.utils.get_chromedriver_filename()
+        driver_path = os.path.join(_DRIVER_CACHE_LOCATION, major_version, driver_filename)
+
+    # Only call the installer if there isn't a cached driver for this version of Chrome, or if offline mode is off and
+    # the installer could update the cached driver (which it can't do for a pinned version)
+    use_cached = _OFFLINE_DRIVER or _PINNED_CHROME_VERSION is not None
+    if not (use_cached and driver_path is not None and os.path.isfile(driver_path)):
+        # The installer rejects a cache location that doesn't exist yet
+        os.makedirs(_DRIVER_CACHE_LOCATION, exist_ok=True)
+        driver_path = chromedriver_autoinstaller.install(path=_DRIVER_CACHE_LOCATION)
+
+    _driver_resolution_time = time.perf_counter() - start
+    return driver_path
+
+
+def _start_driver_resolution():
+    """Starts finding (and if needed downloading) the Chrome driver in the background
+
+    Returns:
+        Future: The location of the Chrome driver executable
+
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    driver_path_future = executor.submit(_resolve_driver)
+    executor.shutdown(wait=False)
+    return driver_path_future
+
+
+def _start_drivers(size=_DRIVER_POOL_SIZE, driver_path_future=None):
+    """Starts downloading the Chrome driver and launching a pool of drivers in the background
+
+    Args:
+        size(int): The number of drivers to launch
+        driver_path_future(Future): The Chrome driver already being found, or None to find it now
+
+    Returns:
+        list(Future): The drivers being launched
 
+    """
+    executor = ThreadPoolExecutor(max_workers=size)
+    if driver_path_future is None:
+        driver_path_future = executor.submit(_resolve_driver)
+
+    driver_futures = [executor.submit(lambda: _create_driver(driver_path_future.result())) for _ in range(size)]
+    executor.shutdown(wait=False)
+    return driver_futures
+
+
+def _quit_driver(driver_future):
+    """Quits a driver that was launched in the background and stops the window tracking it
+
+    Args:
+        driver_future(Future): The driver that has finished launching
+
+    """
+    # A driver that never launched or failed to launch has nothing to quit
+    if driver_future.cancelled() or driver_future.exception() is not None:
+        return
+
+    driver = driver_future.result()
     driver.quit()
-    update_driver(None)
-    return list(filter(lambda html: _is_saturday_match(html), htmls))
+    update_driver(driver, quit=True)
+
+
+def _quit_drivers(driver_futures):
+    """Quits every driver that was launched in the background without waiting for any to finish launching
+
+    Args:
+        driver_futures(list(Future)): The drivers being launched
+
+    """
+    for driver_future in driver_futures:
+        # Drivers that haven't started launching never will, and the rest are quit as soon as they've launched
+        if not driver_future.cancel():
+            driver_future.add_done_callback(_quit_driver)
+
+
+def _get_cached_htmls_with_js(urls):
+    """Gets the HTML after the javascript has loaded from the cache, for the webpages that have been loaded recently
+
+    Args:
+        urls(list(str)): The URLs of the webpages
+
+    Returns:
+        tuple(list(str), list(str)): The cached HTML of the Saturday webpages, and the URLs of the webpages that need
+                                     to be loaded in a browser
+
+    """
+    htmls = []
+    urls_to_load = []
+    for url in urls:
+        html = get_cached_html(_deep_cache_key(url))
+        if html is None:
+            urls_to_load.append(url)
+        elif _is_saturday_match(html):
+            htmls.append(html)
+
+    return htmls, urls_to_load
+
+
+def _get_htmls_with_js(driver_futures, urls):
+    """Gets the HTML after the javascript has loaded from a list of provided URLs
+
+    Args:
+        driver_futures(list(Future)): The drivers being launched to load the webpages with
+        urls(list(str)): The URLs of the webpages
+
+    Yields:
+        str: The HTML of each Saturday webpage, as soon as it has been scraped
+
+    """
+    if urls:
+        progress_start = _SHALLOW_SCRAPE_LENGTH + _EMBEDDED_SCRAPE_LENGTH
+        update_progress('Waiting for Chrome to start...', progress_start)
+
+        # Report how long it took to find a Chrome driver, once the first driver has launched
+        wait(driver_futures, return_when=FIRST_COMPLETED)
+        if _driver_resolution_time is not None:
+            update_progress(f'Chrome started (driver found in {_driver_resolution_time:.1f}s)...', progress_start)
+
+        for html in _DriverPool(driver_futures, urls).scrape():
+            if _is_saturday_match(html):
+                yield html
 
 
 def _get_current_date(grade_html):
@@ -329,55 +931,181 @@ def _get_grade_dates(grade_html):
     return dates
 
 
-def _transform_grade_urls(grade_urls, date_string):
-    """Make sure the grade urls have the correct date
+def _get_grade_rounds(grade_html):
+    """Gets the URL of each round from a grade HTML string, by the date of the round
 
     Args:
-        grade_urls: The grade URLs to sanitise
+        grade_html(str): The grade HTML string
+
+    Returns:
+        dict(str: str): The round URLs by date
+
+    """
+    grade_rounds = {}
+    for date_string, round_url in zip(_get_grade_dates(grade_html), _get_round_urls(grade_html)):
+        grade_rounds.setdefault(date_string, round_url)
+
+    return grade_rounds
+
+
+def _build_season_index():
+    """Builds the season index by shallow scraping every Saturday grade, and saves it to disk
 
     Returns:
-        list(str): The sanitised grade URLs
+        dict(str: dict(str: str)): The round URLs by date for each grade URL
 
     """
-    # Get the HTML for each URL
+    competitions_html = _get_html(_COMPETITIONS_URL)
+    grades_url = _get_grades_url(competitions_html)
+    grades_html = _get_html(grades_url)
+    grade_urls = _get_grade_urls(grades_html)
+
     grade_htmls = _get_grade_htmls([f'{grade_url}/R1' for grade_url in grade_urls])
-    dates = [_get_grade_dates(grade_html) for grade_html in grade_htmls]
+    season_index = {
+        grade_url: _get_grade_rounds(grade_html) if grade_html is not None else {}
+        for grade_url, grade_html in zip(grade_urls, grade_htmls)
+    }
 
-    # Verify that there is at least one grade playing on the date specified
-    round_not_found = True
-    for date_strings in dates:
-        if date_string in date_strings:
-            round_not_found = False
-            break
+    # Only save the index if every grade's rounds were found, so a grade whose page failed to load isn't left out of
+    # every run until the index expires
+    if all(season_index.values()):
+        os.makedirs(os.path.dirname(_SEASON_INDEX_LOCATION), exist_ok=True)
+        with open(_SEASON_INDEX_LOCATION, 'w') as f:
+            json.dump({'built': datetime.now().isoformat(), 'grades': season_index}, f)
+
+    return season_index
+
+
+def _load_season_index():
+    """Loads the season index from disk, unless it's missing, expired, incomplete or being refreshed
+
+    Returns:
+        dict(str: dict(str: str)): The round URLs by date for each grade URL, or None if it needs to be built
 
-    if round_not_found:
+    """
+    if _REFRESH_SEASON_INDEX or not os.path.isfile(_SEASON_INDEX_LOCATION):
+        return None
+
+    try:
+        with open(_SEASON_INDEX_LOCATION) as f:
+            data = json.load(f)
+
+        built = datetime.fromisoformat(data['built'])
+        grades = data['grades']
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if datetime.now() - built > _SEASON_INDEX_TTL:
+        return None
+
+    # Rebuild the index if any grade's rounds are missing from it
+    if not all(grades.values()):
+        return None
+
+    return grades
+
+
+def _transform_grade_urls(season_index, date_string):
+    """Gets the URLs of the rounds being played on a date from the season index
+
+    Args:
+        season_index(dict(str: dict(str: str))): The round URLs by date for each grade URL
+        date_string(str): The date of the rounds
+
+    Returns:
+        list(str): The round URLs
+
+    """
+    round_urls = [grade_rounds[date_string] for grade_rounds in season_index.values() if date_string in grade_rounds]
+
+    # Verify that there is at least one grade playing on the date specified
+    if not round_urls:
         raise RoundNotFoundException(date_string)
 
-    round_indices = []
-    index = 0
-    for dates_ in dates:
-        if date_string not in dates_:
-            grade_htmls.pop(index)
-            continue
+    return round_urls
 
-        date_index = dates_.index(date_string)
-        round_indices.append(date_index)
-        index += 1
 
-    return [_get_grade_url_by_round(grade_htmls[i], round_indices[i]) for i in range(len(grade_htmls))]
+def _stream_grade_htmls(driver_path_future, driver_futures, grade_htmls, grade_urls):
+    """Streams the HTML of the grade pages that have been fetched, and then of the pages loaded in a browser
+
+    Args:
+        driver_path_future(Future): The Chrome driver already being found, or None if it hasn't been looked for yet
+        driver_futures(list(Future)): The drivers being launched, which are quit once streaming has finished
+        grade_htmls(deque(str)): The HTML of the grade pages that have already been fetched
+        grade_urls(list(str)): The URLs of the grade pages that still need to be loaded in a browser
+
+    Yields:
+        str: The HTML of each grade page, as soon as it has been scraped
+
+    Raises:
+        ScrapeException: If a grade page couldn't be scraped
+
+    """
+    try:
+        # Let go of each page once it has been handed over
+        while grade_htmls:
+            yield grade_htmls.popleft()
+
+        if grade_urls:
+            driver_futures = driver_futures or _start_drivers(
+                min(_DRIVER_POOL_SIZE, len(grade_urls)), driver_path_future
+            )
+            yield from _get_htmls_with_js(driver_futures, grade_urls)
+    except Exception as e:
+        raise ScrapeException(str(e)) from e
+    finally:
+        _quit_drivers(driver_futures)
+        save_cache()
 
 
 def get_all_grade_htmls(date_string):
     """Gets the HTML of all required grade pages
+       The round URLs and any pages that don't need a browser are fetched straight away, and the rest are scraped
+       as the returned generator is consumed
 
     Returns:
-        list(str): The list of grade page HTML strings
+        generator(str): The grade page HTML strings, as each one is scraped
 
     """
-    competitions_html = _get_html(_COMPETITIONS_URL)
-    grades_url = _get_grades_url(competitions_html)
-    grades_html = _get_html(grades_url)
-    grade_urls = _get_grade_urls(grades_html)
-    grade_urls = _transform_grade_urls(grade_urls, date_string)
-    grade_htmls_with_js = _get_htmls_with_js(grade_urls)
-    return grade_htmls_with_js
+    for counter in _revalidation_stats:
+        _revalidation_stats[counter] = 0
+
+    # Find the Chrome driver in the background while the pages that don't need a browser are fetched
+    driver_path_future = _start_driver_resolution() if _START_DRIVERS_EARLY else None
+
+    driver_futures = []
+    try:
+        # Resolve the round URLs from the season index, rebuilding it if it's out of date or missing the date
+        season_index = _load_season_index()
+        if season_index is None or not any(date_string in rounds for rounds in season_index.values()):
+            season_index = _build_season_index()
+
+        grade_urls = _transform_grade_urls(season_index, date_string)
+
+        # Read as many grades as possible from their embedded state, and only load the rest in a browser
+        grade_htmls = []
+        if _USE_EMBEDDED_STATE:
+            grade_htmls, grade_urls = _get_htmls_from_state(grade_urls)
+
+        # Take the pages that need a browser from the cache where possible
+        cached_htmls, grade_urls = _get_cached_htmls_with_js(grade_urls)
+        grade_htmls += cached_htmls
+
+        # Launch Chrome in the background as soon as a page is known to need it, so it's ready by the time the pages
+        # that don't have been parsed
+        if grade_urls and _START_DRIVERS_EARLY:
+            driver_futures = _start_drivers(min(_DRIVER_POOL_SIZE, len(grade_urls)), driver_path_future)
+
+        # Report how much revalidating cached pages saved
+        if _revalidation_stats['hits'] or _revalidation_stats['misses']:
+            update_info = (
+                f'Fetched pages: {_revalidation_stats["hits"]} unchanged, {_revalidation_stats["misses"]} downloaded, '
+                f'{_revalidation_stats["bytes_saved"] // 1024} KB saved'
+            )
+            update_progress(update_info, _SHALLOW_SCRAPE_LENGTH + _EMBEDDED_SCRAPE_LENGTH)
+
+    except Exception:
+        _quit_drivers(driver_futures)
+        raise
+
+    return _stream_grade_htmls(driver_path_future, driver_futures, deque(grade_htmls), grade_urls)
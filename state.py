@@ -0,0 +1,252 @@
+import json
+import re
+
+from datetime import datetime
+
+# Matches the script element that holds the state the page was rendered from
+_STATE_PATTERN = re.compile(r'<script id="__NEXT_DATA__" type="application/json"[^>]*>(.*?)</script>', re.DOTALL)
+
+# Team names that are placeholders for teams that haven't been decided yet
+_PLACEHOLDER_TEAMS = ('Ladder Position', 'Winner Game')
+
+# The status given to a game that has been forfeited
+_FORFEIT_STATUS = 'FORFEIT'
+
+
+class FixtureGame:
+    """Represents a game as it appears in the embedded state of a grade page
+
+    """
+    def __init__(self, team1, team2, date, time, location, court, forfeit):
+        self.team1 = team1
+        self.team2 = team2
+        self.date = date
+        self.time = time
+        self.location = location
+        self.court = court
+        self.forfeit = forfeit
+
+
+class FixtureState:
+    """Represents the fixture information held in the embedded state of a grade page
+
+    """
+    def __init__(self, date, grade, games):
+        self.date = date
+        self.grade = grade
+        self.games = games
+
+
+def _walk(node):
+    """Iterates through every dictionary in a JSON object
+
+    Args:
+        node(object): The JSON object
+
+    Yields:
+        dict: Each dictionary in the JSON object
+
+    """
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def _get_name(node):
+    """Gets the name of a JSON object, if it has one
+
+    Args:
+        node(object): The JSON object
+
+    Returns:
+        str: The name, or None if the object has no name
+
+    """
+    if isinstance(node, dict) and isinstance(node.get('name'), str):
+        return node['name']
+
+    return None
+
+
+def _get_team(node):
+    """Gets a team name from a JSON object, blanking out teams that haven't been decided yet
+
+    Args:
+        node(object): The JSON object
+
+    Returns:
+        str: The team name
+
+    """
+    team = _get_name(node)
+    if team is None or any(placeholder in team for placeholder in _PLACEHOLDER_TEAMS):
+        return ''
+
+    return team
+
+
+def _get_game_date(node):
+    """Gets the date a game is played on from the JSON object that describes it
+
+    Args:
+        node(dict): The JSON object that describes the game
+
+    Returns:
+        datetime: The date, or None if the game hasn't been allocated a date
+
+    """
+    allocation = node.get('allocation') or {}
+    date_string = allocation.get('date')
+    return datetime.strptime(date_string[:10], '%Y-%m-%d') if date_string else None
+
+
+def _get_game(node):
+    """Converts a JSON object into a FixtureGame object
+
+    Args:
+        node(dict): The JSON object that describes the game
+
+    Returns:
+        FixtureGame: The game, with None for any date, time, location or court that hasn't been allocated
+
+    """
+    allocation = node.get('allocation') or {}
+    court = allocation.get('court') or {}
+    date = _get_game_date(node)
+    time_string = allocation.get('time')
+    time = datetime.strptime(time_string[:5], '%H:%M') if time_string else None
+    forfeit = _FORFEIT_STATUS in str(node.get('status', '')).upper()
+    return FixtureGame(
+        _get_team(node.get('home')),
+        _get_team(node.get('away')),
+        date,
+        time,
+        _get_name(court.get('venue')),
+        _get_name(court),
+        forfeit
+    )
+
+
+def _is_game(node):
+    """Checks if a JSON object describes a game
+
+    Args:
+        node(dict): The JSON object
+
+    Returns:
+        bool: True if the object describes a game, otherwise False
+
+    """
+    return 'home' in node and 'away' in node and 'allocation' in node
+
+
+def get_state_string(grade_html):
+    """Gets the JSON string of the state embedded in a grade page
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        str: The JSON string, or None if the page doesn't embed its state
+
+    """
+    state_match = _STATE_PATTERN.search(grade_html)
+    return state_match.group(1) if state_match is not None else None
+
+
+def _load_state(grade_html):
+    """Loads the state embedded in a grade page
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        object: The JSON object of the state, or None if the page doesn't embed a valid state
+
+    """
+    state_string = get_state_string(grade_html)
+    if state_string is None:
+        return None
+
+    try:
+        return json.loads(state_string)
+    except ValueError:
+        return None
+
+
+def get_game_dates(grade_html):
+    """Gets the dates of the games in the state embedded in a grade page, even if the state isn't usable for anything
+       else (e.g. it's missing the grade or some games haven't been given a date)
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        list(datetime): The dates of the games that have one, which is empty if the page doesn't embed its state
+
+    """
+    state = _load_state(grade_html)
+    if state is None:
+        return []
+
+    dates = []
+    for node in _walk(state):
+        if not _is_game(node):
+            continue
+
+        try:
+            date = _get_game_date(node)
+        except (AttributeError, TypeError, ValueError):
+            continue
+
+        if date is not None:
+            dates.append(date)
+
+    return dates
+
+
+def get_fixture_state(grade_html):
+    """Gets the fixture information from the state embedded in a grade page
+
+    Args:
+        grade_html(str): The grade HTML string
+
+    Returns:
+        FixtureState: The fixture information, or None if the page doesn't embed usable fixture information
+
+    """
+    state = _load_state(grade_html)
+    if state is None:
+        return None
+
+    grade = None
+    games = []
+    try:
+        for node in _walk(state):
+            if _is_game(node):
+                games.append(_get_game(node))
+            elif grade is None and _get_name(node.get('grade')) is not None:
+                grade = node['grade']['name']
+    except (AttributeError, TypeError, ValueError):
+        # The state isn't shaped the way it's expected to be
+        return None
+
+    # Leave pages without games (e.g. errors or unconfirmed rounds) to be loaded in a browser
+    if grade is None or not games:
+        return None
+
+    # The round's provisional date isn't always the date its games are played on, so the date is read from the games
+    # themselves, and a page with an allocated game that has no date is left to be loaded in a browser instead
+    if any(game.date is None and game.time is not None for game in games):
+        return None
+
+    dates = [game.date for game in games if game.date is not None]
+    if not dates:
+        return None
+
+    # Like the date shown on the rendered page, the date is that of the first game
+    return FixtureState(dates[0], grade, games)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend
+
+from parser import GradePage
+from roster import Location, Court
+
+# A grade page with a forfeit, a TBC slot and teams that haven't been decided yet
+_GRADE_PAGE_LOCATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages', 'grade_page.html')
+
+# The matches every backend must extract from the grade page, with forfeited and TBC matches left out
+_EXPECTED_MATCHES = [
+    ('12Division 3', 'Côte Hornets 1', 'Sandy Sharks 1', datetime(1900, 1, 1, 9), Location.PARKDALE, Court.COURT_1),
+    ('12Division 3', 'Bayside Büffel 1', '', datetime(1900, 1, 1, 10, 40), Location.MENTONE_GRAMMAR, Court.COURT_3),
+    (
+        '12Division 3', 'Sandy Sharks 2', 'Mentone Magic 1', datetime(1900, 1, 1, 11, 30), Location.KING_CLUB,
+        Court.COURT_2
+    )
+]
+
+
+@pytest.fixture(params=['html.parser', 'lxml', 'selectolax'])
+def parser_backend(request, monkeypatch):
+    monkeypatch.setattr(backend, '_PARSER_BACKEND', request.param)
+    if backend.get_backend() != request.param:
+        pytest.skip(f'{request.param} is not installed')
+
+    return request.param
+
+
+def test_grade_page_matches(parser_backend):
+    with open(_GRADE_PAGE_LOCATION, encoding='utf-8') as f:
+        grade_page = GradePage(f.read())
+
+    matches = [
+        (match.grade, match.team1, match.team2, match.time, match.location, match.court)
+        for match in grade_page.matches
+    ]
+    assert grade_page.date == datetime(2023, 5, 6)
+    assert matches == _EXPECTED_MATCHES
@@ -0,0 +1,56 @@
+import os
+import sys
+
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clash import find_clashes
+from roster import Location, Court, Match, Round, Roster
+
+
+def _time(hour, minute=0):
+    return datetime(1900, 1, 1, hour, minute)
+
+
+def _find_clashes(matches):
+    return find_clashes(Roster(datetime(2023, 5, 6), [Round(matches)]).to_dictionary())
+
+
+def test_back_to_back_slots_are_not_clashes():
+    clashes = _find_clashes([
+        Match('12B3', 'Sandy Sharks 1', 'Mentone Magic 1', _time(9), Location.PARKDALE, Court.COURT_1),
+        Match('12B3', 'Sandy Sharks 1', 'Mentone Magic 2', _time(9, 50), Location.PARKDALE, Court.COURT_1),
+        Match('12B3', 'Sandy Sharks 2', 'Mentone Magic 3', _time(10, 40), Location.PARKDALE, Court.COURT_1)
+    ])
+    assert len(clashes) == 0
+
+
+def test_same_court_and_time_is_a_court_clash():
+    match1 = Match('12B3', 'Sandy Sharks 1', 'Mentone Magic 1', _time(9), Location.PARKDALE, Court.COURT_1)
+    match2 = Match('14G2', 'Côte Hornets 1', 'Bayside Büffel 1', _time(9), Location.PARKDALE, Court.COURT_1)
+    clashes = _find_clashes([match1, match2])
+    assert clashes.court_clashes == [(match1, match2)]
+    assert clashes.team_clashes == []
+
+
+def test_same_team_name_in_different_grades_is_not_a_clash():
+    clashes = _find_clashes([
+        Match('12B3', 'Sandy Sharks 1', 'Mentone Magic 1', _time(9), Location.PARKDALE, Court.COURT_1),
+        Match('12B3', 'Côte Hornets 1', 'Bayside Büffel 1', _time(9, 50), Location.PARKDALE, Court.COURT_1),
+        Match('14G2', 'Sandy Sharks 1', 'Côte Hornets 2', _time(9, 30), Location.KING_CLUB, Court.COURT_2)
+    ])
+    assert len(clashes) == 0
+
+
+def test_overlap_after_a_one_match_court_is_a_team_clash():
+    # King Club Court 2 has only one start time, so it takes the 50 minute slots of Parkdale Court 1
+    match1 = Match('12B3', 'Sandy Sharks 1', 'Mentone Magic 1', _time(9), Location.KING_CLUB, Court.COURT_2)
+    match2 = Match('12B3', 'Sandy Sharks 1', 'Côte Hornets 1', _time(9, 30), Location.PARKDALE, Court.COURT_1)
+    clashes = _find_clashes([
+        match1,
+        match2,
+        Match('12B3', 'Bayside Büffel 1', 'Mentone Magic 2', _time(10, 20), Location.PARKDALE, Court.COURT_1)
+    ])
+    assert clashes.team_clashes == [(('12B3', 'Sandy Sharks 1'), match1, match2)]
+    assert clashes.court_clashes == []
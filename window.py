@@ -113,14 +113,15 @@ def update_progress(info, value):
     WINDOW.write_event_value(THREAD_PROGRESS_EVENT, (info, value))
 
 
-def update_driver(driver):
-    """Sends an event to the window with a driver
+def update_driver(driver, quit=False):
+    """Sends an event to the window with a driver to track, or to stop tracking once it has been quit
 
     Args:
         driver(WebDriver): The driver to send
+        quit(bool): Whether the driver has been quit
 
     """
-    WINDOW.write_event_value(THREAD_DRIVER_EVENT, driver)
+    WINDOW.write_event_value(THREAD_DRIVER_EVENT, (driver, quit))
 
 
 def update_error(error_msg):